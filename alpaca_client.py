@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import date as date_cls
+from datetime import datetime
+from datetime import timedelta
 
+from alpaca.common.exceptions import APIError
 from alpaca.data import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 from alpaca.data.historical import StockHistoricalDataClient
@@ -19,9 +25,27 @@ from alpaca.trading.enums import OrderClass, OrderSide, TimeInForce
 
 import pandas as pd
 
+from bar_cache import (
+    DailyBarCache,
+    last_completed_session_date,
+    market_opened,
+    merge_bars,
+    ny_date,
+    ny_day_end,
+    ny_day_start,
+)
+from calendar_cache import TradingCalendarCache
 from config import AppConfig
 
 
+# Symbols per StockBarsRequest; the SDK pages through the combined response.
+BARS_BATCH_SIZE = 25
+# Extra attempts after the SDK's own 429 retries give up; each one waits
+# RATE_LIMIT_BACKOFF_SECONDS * 2**attempt before any queued call is sent.
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF_SECONDS = 3.0
+
+
 @dataclass(frozen=True)
 class AlpacaOrderResult:
     order_id: str
@@ -41,6 +65,16 @@ class AlpacaClient:
             api_key=config.api_key,
             secret_key=config.api_secret,
         )
+        self.daily_bar_ready_time = config.daily_bar_ready_time
+        self.max_concurrency = config.alpaca_max_concurrency
+        self._calendar_cache = (
+            TradingCalendarCache(config.calendar_cache_path)
+            if config.calendar_cache_path
+            else None
+        )
+        self._bar_cache = (
+            DailyBarCache(config.bar_cache_dir) if config.bar_cache_dir else None
+        )
 
     def place_order(
         self,
@@ -102,8 +136,30 @@ class AlpacaClient:
     def get_order(self, order_id: str):
         return self._trading.get_order_by_id(order_id)
 
-    def list_recent_orders(self, limit: int = 50, status: str = "closed"):
-        request = GetOrdersRequest(status=status, limit=limit)
+    def get_orders_by_id(self, order_ids: list[str], max_workers: int = 8) -> dict:
+        # The orders endpoint cannot filter by id, so fan out with a bounded
+        # pool; ids that fail to load are left out.
+        def _fetch(order_id: str):
+            try:
+                return order_id, self._trading.get_order_by_id(order_id)
+            except Exception:
+                return order_id, None
+
+        unique_ids = list(dict.fromkeys(order_ids))
+        if not unique_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as pool:
+            results = pool.map(_fetch, unique_ids)
+        return {order_id: order for order_id, order in results if order is not None}
+
+    def list_recent_orders(
+        self,
+        limit: int = 50,
+        status: str = "closed",
+        after: datetime | None = None,
+        until: datetime | None = None,
+    ):
+        request = GetOrdersRequest(status=status, limit=limit, after=after, until=until)
         return self._trading.get_orders(request)
 
     def get_clock(self):
@@ -113,6 +169,15 @@ class AlpacaClient:
         request = GetCalendarRequest(start=start_date, end=end_date)
         return self._trading.get_calendar(request)
 
+    def count_trading_sessions(self, start_date: date_cls, end_date: date_cls) -> int:
+        if end_date < start_date:
+            return 0
+        if self._calendar_cache is None:
+            return len(self.get_calendar(start_date.isoformat(), end_date.isoformat()))
+        return self._calendar_cache.count_sessions(
+            self.get_calendar, start_date, end_date
+        )
+
     def close_position(self, symbol: str):
         return self._trading.close_position(symbol)
 
@@ -120,41 +185,262 @@ class AlpacaClient:
         return self._trading.get_all_positions()
 
     def get_recent_daily_bars(self, symbol: str, days: int = 10):
-        end = datetime.now(timezone.utc)
-        start = end - timedelta(days=days)
-        request = StockBarsRequest(
-            symbol_or_symbols=symbol,
-            timeframe=TimeFrame.Day,
-            start=start,
-            end=end,
-            feed="iex",
-        )
-        bars = self._data.get_stock_bars(request)
-        df = bars.df
-        if df is None or df.empty:
-            return None
-        if isinstance(df.index, pd.MultiIndex):
-            return df.xs(symbol, level=0)
-        if "symbol" in df.columns:
-            return df[df["symbol"] == symbol]
-        return df
+        return self.get_recent_daily_bars_many([symbol], days=days).get(symbol)
+
+    def get_recent_daily_bars_many(
+        self, symbols: list[str], days: int = 10
+    ) -> dict[str, pd.DataFrame]:
+        end = pd.Timestamp.now(tz="UTC")
+        start = end - pd.Timedelta(days=days)
+        return self._cached_daily_bars_many(symbols, start, end)
 
     def get_daily_bars(self, symbol: str, start: str, end: str):
-        start_dt = pd.to_datetime(start, utc=True).to_pydatetime()
-        end_dt = pd.to_datetime(end, utc=True).to_pydatetime()
-        request = StockBarsRequest(
-            symbol_or_symbols=symbol,
-            timeframe=TimeFrame.Day,
-            start=start_dt,
-            end=end_dt,
-            feed="iex",
+        return self.get_daily_bars_many([symbol], start, end).get(symbol)
+
+    def get_daily_bars_many(
+        self, symbols: list[str], start: str, end: str
+    ) -> dict[str, pd.DataFrame]:
+        start_ts = pd.to_datetime(start, utc=True)
+        end_ts = pd.to_datetime(end, utc=True)
+        return self._cached_daily_bars_many(symbols, start_ts, end_ts)
+
+    def _cached_daily_bars_many(
+        self, symbols: list[str], start: pd.Timestamp, end: pd.Timestamp
+    ) -> dict[str, pd.DataFrame]:
+        symbols = list(dict.fromkeys(symbols))
+        if self._bar_cache is None:
+            return self._fetch_daily_bars_many(symbols, start, end)
+
+        # Only sessions completed before the daily-bar cutoff are persisted; the
+        # in-progress session is always fetched live and never cached.
+        now = pd.Timestamp.now(tz="UTC")
+        final_date = last_completed_session_date(now, self.daily_bar_ready_time)
+        start_date = ny_date(start)
+        end_date = min(ny_date(end), final_date)
+        loaded = {symbol: self._bar_cache.load(symbol) for symbol in symbols}
+        if start_date <= end_date:
+            missing: dict[tuple[date_cls, date_cls], list[str]] = {}
+            coverage: dict[str, tuple[date_cls, date_cls]] = {}
+            for symbol, (_, meta) in loaded.items():
+                covered_start = meta.get("start")
+                complete_through = meta.get("complete_through")
+                if not covered_start or not complete_through:
+                    missing.setdefault((start_date, end_date), []).append(symbol)
+                    coverage[symbol] = (start_date, end_date)
+                    continue
+                covered_start = date_cls.fromisoformat(covered_start)
+                complete_through = date_cls.fromisoformat(complete_through)
+                if start_date < covered_start:
+                    head = (start_date, covered_start - timedelta(days=1))
+                    missing.setdefault(head, []).append(symbol)
+                if complete_through < end_date:
+                    tail = (complete_through + timedelta(days=1), end_date)
+                    missing.setdefault(tail, []).append(symbol)
+                if start_date < covered_start or complete_through < end_date:
+                    coverage[symbol] = (
+                        min(start_date, covered_start),
+                        max(end_date, complete_through),
+                    )
+            for (range_start, range_end), group in missing.items():
+                fetched = self._fetch_daily_bars_many(
+                    group, ny_day_start(range_start), ny_day_end(range_end)
+                )
+                for symbol in group:
+                    cached, meta = loaded[symbol]
+                    loaded[symbol] = (merge_bars(cached, fetched.get(symbol)), meta)
+            for symbol, (covered_start, complete_through) in coverage.items():
+                self._bar_cache.store(
+                    symbol,
+                    loaded[symbol][0],
+                    {
+                        "start": covered_start.isoformat(),
+                        "complete_through": complete_through.isoformat(),
+                    },
+                )
+
+        live: dict[str, pd.DataFrame] = {}
+        if ny_date(end) > final_date and self._session_in_progress(now):
+            live_start = max(start, ny_day_start(final_date + timedelta(days=1)))
+            live = self._fetch_daily_bars_many(symbols, live_start, end)
+        result: dict[str, pd.DataFrame] = {}
+        for symbol in symbols:
+            cached = loaded[symbol][0]
+            bars = cached[(cached.index >= start) & (cached.index <= end)]
+            bars = merge_bars(bars, live.get(symbol))
+            if not bars.empty:
+                result[symbol] = bars
+        return result
+
+    def _session_in_progress(self, now: pd.Timestamp) -> bool:
+        # Past final_date only today's bar can be live, and it does not exist
+        # before the open or on days the exchange is closed.
+        if not market_opened(now):
+            return False
+        today = ny_date(now)
+        if self._calendar_cache is None:
+            return today.weekday() < 5
+        try:
+            return self.count_trading_sessions(today, today) > 0
+        except Exception:
+            return True
+
+    def _fetch_daily_bars_many(
+        self, symbols: list[str], start: pd.Timestamp, end: pd.Timestamp
+    ) -> dict[str, pd.DataFrame]:
+        result: dict[str, pd.DataFrame] = {}
+        for offset in range(0, len(symbols), BARS_BATCH_SIZE):
+            chunk = symbols[offset : offset + BARS_BATCH_SIZE]
+            request = StockBarsRequest(
+                symbol_or_symbols=chunk if len(chunk) > 1 else chunk[0],
+                timeframe=TimeFrame.Day,
+                start=start.to_pydatetime(),
+                end=end.to_pydatetime(),
+                feed="iex",
+            )
+            bars = self._data.get_stock_bars(request)
+            df = bars.df
+            if df is None or df.empty:
+                continue
+            if isinstance(df.index, pd.MultiIndex):
+                for symbol in df.index.get_level_values(0).unique():
+                    if symbol in chunk:
+                        result[symbol] = df.xs(symbol, level=0)
+            elif "symbol" in df.columns:
+                for symbol in chunk:
+                    symbol_df = df[df["symbol"] == symbol]
+                    if not symbol_df.empty:
+                        result[symbol] = symbol_df
+            elif len(chunk) == 1:
+                result[chunk[0]] = df
+        return result
+
+
+class AsyncAlpacaClient:
+    # Awaitable facade over AlpacaClient. SDK calls run on a bounded thread
+    # pool; a 429 makes every caller wait out one shared backoff. Create it
+    # inside the running event loop and close it when done.
+    def __init__(self, client: AlpacaClient, max_concurrency: int | None = None) -> None:
+        self.client = client
+        self.daily_bar_ready_time = client.daily_bar_ready_time
+        self.max_concurrency = max_concurrency or client.max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._resume_at = 0.0
+
+    async def __aenter__(self) -> AsyncAlpacaClient:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _call(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        async with self._semaphore:
+            attempt = 0
+            while True:
+                delay = self._resume_at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                try:
+                    return await loop.run_in_executor(self._executor, call)
+                except APIError as exc:
+                    if exc.status_code != 429 or attempt >= RATE_LIMIT_RETRIES:
+                        raise
+                self._resume_at = max(
+                    self._resume_at,
+                    loop.time() + RATE_LIMIT_BACKOFF_SECONDS * 2**attempt,
+                )
+                attempt += 1
+
+    async def place_order(self, *args, **kwargs) -> AlpacaOrderResult:
+        return await self._call(self.client.place_order, *args, **kwargs)
+
+    async def get_order(self, order_id: str):
+        return await self._call(self.client.get_order, order_id)
+
+    async def get_orders_by_id(self, order_ids: list[str]) -> dict:
+        async def _fetch(order_id: str):
+            try:
+                return order_id, await self.get_order(order_id)
+            except Exception:
+                return order_id, None
+
+        results = await asyncio.gather(
+            *(_fetch(order_id) for order_id in dict.fromkeys(order_ids))
+        )
+        return {order_id: order for order_id, order in results if order is not None}
+
+    async def list_recent_orders(
+        self,
+        limit: int = 50,
+        status: str = "closed",
+        after: datetime | None = None,
+        until: datetime | None = None,
+    ):
+        return await self._call(
+            self.client.list_recent_orders, limit, status, after, until
+        )
+
+    async def get_clock(self):
+        return await self._call(self.client.get_clock)
+
+    async def get_calendar(self, start_date: str, end_date: str):
+        return await self._call(self.client.get_calendar, start_date, end_date)
+
+    async def count_trading_sessions(
+        self, start_date: date_cls, end_date: date_cls
+    ) -> int:
+        return await self._call(
+            self.client.count_trading_sessions, start_date, end_date
+        )
+
+    async def close_position(self, symbol: str):
+        return await self._call(self.client.close_position, symbol)
+
+    async def list_open_positions(self):
+        return await self._call(self.client.list_open_positions)
+
+    async def get_recent_daily_bars(self, symbol: str, days: int = 10):
+        return (await self.get_recent_daily_bars_many([symbol], days=days)).get(symbol)
+
+    async def get_recent_daily_bars_many(
+        self, symbols: list[str], days: int = 10
+    ) -> dict[str, pd.DataFrame]:
+        end = pd.Timestamp.now(tz="UTC")
+        start = end - pd.Timedelta(days=days)
+        return await self._daily_bars_many(symbols, start, end)
+
+    async def get_daily_bars(self, symbol: str, start: str, end: str):
+        return (await self.get_daily_bars_many([symbol], start, end)).get(symbol)
+
+    async def get_daily_bars_many(
+        self, symbols: list[str], start: str, end: str
+    ) -> dict[str, pd.DataFrame]:
+        start_ts = pd.to_datetime(start, utc=True)
+        end_ts = pd.to_datetime(end, utc=True)
+        return await self._daily_bars_many(symbols, start_ts, end_ts)
+
+    async def _daily_bars_many(
+        self, symbols: list[str], start: pd.Timestamp, end: pd.Timestamp
+    ) -> dict[str, pd.DataFrame]:
+        # One request batch per chunk, all in flight at once; chunks never
+        # share a symbol, so their bar cache files do not collide.
+        symbols = list(dict.fromkeys(symbols))
+        chunks = [
+            symbols[offset : offset + BARS_BATCH_SIZE]
+            for offset in range(0, len(symbols), BARS_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._call(self.client._cached_daily_bars_many, chunk, start, end)
+                for chunk in chunks
+            )
         )
-        bars = self._data.get_stock_bars(request)
-        df = bars.df
-        if df is None or df.empty:
-            return None
-        if isinstance(df.index, pd.MultiIndex):
-            return df.xs(symbol, level=0)
-        if "symbol" in df.columns:
-            return df[df["symbol"] == symbol]
-        return df
+        bars: dict[str, pd.DataFrame] = {}
+        for result in results:
+            bars.update(result)
+        return bars
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from bisect import insort
+from collections import deque
 from dataclasses import dataclass
 import os
 
+import numpy as np
 import pandas as pd
 
 from alpaca_client import AlpacaClient
-from regime import detect_regime, regime_allows
+from regime import regime_allows, regime_series
 
 
 @dataclass(frozen=True)
@@ -39,102 +42,191 @@ def _to_ny_timestamp(value: pd.Timestamp) -> str:
     return value.tz_convert("America/New_York").isoformat()
 
 
-def _signal_triggered(df: pd.DataFrame, signal_index: int, setup_name: str) -> bool:
-    prior = df.iloc[signal_index - 1]
-    latest = df.iloc[signal_index]
+def _slice_bars(bars: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    if bars.empty:
+        return bars
+    start_ts = pd.to_datetime(start, utc=True)
+    end_ts = pd.to_datetime(end, utc=True)
+    return bars[(bars.index >= start_ts) & (bars.index <= end_ts)]
+
+
+def setup_signal_mask(df: pd.DataFrame, setup_name: str) -> np.ndarray:
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    mask = np.zeros(len(df), dtype=bool)
+    if len(df) < 2:
+        return mask
     if setup_name == "PrevDayBreakout_D1":
-        return bool(latest["close"] > prior["high"])
-    if setup_name == "TwoDayBreakout_D1":
-        if signal_index < 2:
-            return False
-        prior_two = df.iloc[signal_index - 2]
-        return bool(latest["close"] > max(prior["high"], prior_two["high"]))
-    if setup_name == "MeanReversion_D1":
-        return bool(latest["close"] < prior["low"])
-    return False
+        mask[1:] = close[1:] > high[:-1]
+    elif setup_name == "TwoDayBreakout_D1":
+        if len(df) >= 3:
+            mask[2:] = close[2:] > np.maximum(high[1:-1], high[:-2])
+    elif setup_name == "MeanReversion_D1":
+        mask[1:] = close[1:] < low[:-1]
+    # The last bar has no next session to enter on.
+    mask[-1] = False
+    return mask
 
 
-def _simulate_trade(
+def _signal_indices(
     df: pd.DataFrame,
-    signal_index: int,
+    setup_name: str,
+    regime_filter: dict | None,
+) -> np.ndarray:
+    signal_indices = np.flatnonzero(setup_signal_mask(df, setup_name))
+    if not regime_filter or not regime_filter.get("enabled", False):
+        return signal_indices
+    regimes = regime_series(
+        df,
+        fast_sma=regime_filter.get("fast_sma", 20),
+        slow_sma=regime_filter.get("slow_sma", 50),
+    ).to_numpy()
+    allowed = [
+        index for index in signal_indices if regime_allows(setup_name, regimes[index])
+    ]
+    return np.array(allowed, dtype=np.int64)
+
+
+def _simulate_trades(
+    df: pd.DataFrame,
+    signal_indices: np.ndarray,
     setup_name: str,
     risk_multiple: float,
     time_stop_days: int,
-) -> dict | None:
-    if signal_index + 1 >= len(df):
-        return None
-    prior = df.iloc[signal_index - 1]
-    latest = df.iloc[signal_index]
-    entry_day = df.iloc[signal_index + 1]
-
-    entry_price = entry_day["open"]
+) -> list[tuple[int, dict]]:
+    signal_indices = np.asarray(signal_indices, dtype=np.int64)
+    n = len(df)
+    signal_indices = signal_indices[signal_indices + 1 < n]
+    if setup_name == "TwoDayBreakout_D1":
+        signal_indices = signal_indices[signal_indices >= 2]
+    if signal_indices.size == 0:
+        return []
+
+    open_ = df["open"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+
+    entry_idx = signal_indices + 1
+    entry_price = open_[entry_idx]
     if setup_name == "MeanReversion_D1":
-        stop_price = latest["low"]
+        stop_price = low[signal_indices]
     elif setup_name == "TwoDayBreakout_D1":
-        if signal_index < 2:
-            return None
-        prior_two = df.iloc[signal_index - 2]
-        stop_price = min(prior["low"], prior_two["low"])
+        stop_price = np.minimum(low[signal_indices - 1], low[signal_indices - 2])
     else:
-        stop_price = prior["low"]
-    if entry_price <= stop_price:
-        return None
+        stop_price = low[signal_indices - 1]
+    valid = entry_price > stop_price
+    signal_indices = signal_indices[valid]
+    entry_idx = entry_idx[valid]
+    entry_price = entry_price[valid]
+    stop_price = stop_price[valid]
+    if signal_indices.size == 0:
+        return []
 
     risk = entry_price - stop_price
     target_price = entry_price + risk_multiple * risk
+    last_index = np.minimum(n - 1, signal_indices + time_stop_days)
+
+    # Window k covers bar entry_idx + k; NaN padding past the last bar never
+    # compares true, so windows are cut at the end of the frame.
+    pad = np.full(time_stop_days, np.nan)
+    low_windows = np.lib.stride_tricks.sliding_window_view(
+        np.concatenate([low, pad]), time_stop_days
+    )[entry_idx]
+    high_windows = np.lib.stride_tricks.sliding_window_view(
+        np.concatenate([high, pad]), time_stop_days
+    )[entry_idx]
+    stop_hits = low_windows <= stop_price[:, None]
+    target_hits = high_windows >= target_price[:, None]
+    hits = stop_hits | target_hits
+    any_hit = hits.any(axis=1)
+    first_hit = hits.argmax(axis=1)
+    stop_first = stop_hits[np.arange(len(first_hit)), first_hit]
+
+    exit_idx = np.where(any_hit, entry_idx + first_hit, last_index)
+    exit_price = np.where(
+        any_hit,
+        np.where(stop_first, stop_price, target_price),
+        close[last_index],
+    )
+    r_multiple = np.where(
+        any_hit,
+        np.where(stop_first, -1.0, risk_multiple),
+        (close[last_index] - entry_price) / risk,
+    )
 
-    last_index = len(df) - 1
-    if time_stop_days > 0:
-        last_index = min(last_index, signal_index + time_stop_days)
-
-    exit_price = None
-    exit_reason = None
-    exit_ts = None
-    r_multiple = None
-
-    for idx in range(signal_index + 1, last_index + 1):
-        day = df.iloc[idx]
-        if day["low"] <= stop_price:
-            exit_price = stop_price
-            exit_reason = "SL hit"
-            exit_ts = _to_ny_timestamp(day["timestamp"])
-            r_multiple = -1.0
-            break
-        if day["high"] >= target_price:
-            exit_price = target_price
-            exit_reason = "TP hit"
-            exit_ts = _to_ny_timestamp(day["timestamp"])
-            r_multiple = risk_multiple
-            break
-
-    if exit_price is None:
-        day = df.iloc[last_index]
-        exit_price = day["close"]
-        exit_ts = _to_ny_timestamp(day["timestamp"])
-        r_multiple = (exit_price - entry_price) / risk
-        if r_multiple > 0:
+    ny_timestamps = [
+        value.isoformat()
+        for value in df["timestamp"].dt.tz_convert("America/New_York")
+    ]
+    symbols = df["symbol"].to_numpy()
+
+    trades: list[tuple[int, dict]] = []
+    for pos, signal_index in enumerate(signal_indices):
+        r_value = float(r_multiple[pos])
+        if any_hit[pos]:
+            exit_reason = "SL hit" if stop_first[pos] else "TP hit"
+        elif r_value > 0:
             exit_reason = "time stop win"
-        elif r_multiple < 0:
+        elif r_value < 0:
             exit_reason = "time stop loss"
         else:
             exit_reason = "time stop scratch"
+        outcome = "win" if r_value > 0 else "loss" if r_value < 0 else "scratch"
+        trades.append(
+            (
+                int(signal_index),
+                {
+                    "symbol": symbols[entry_idx[pos]],
+                    "setup_name": setup_name,
+                    "signal_ts": ny_timestamps[signal_index],
+                    "entry_ts": ny_timestamps[entry_idx[pos]],
+                    "entry_price": round(float(entry_price[pos]), 4),
+                    "stop_price": round(float(stop_price[pos]), 4),
+                    "target_price": round(float(target_price[pos]), 4),
+                    "exit_ts": ny_timestamps[exit_idx[pos]],
+                    "exit_price": round(float(exit_price[pos]), 4),
+                    "exit_reason": exit_reason,
+                    "r_multiple": round(r_value, 4),
+                    "outcome": outcome,
+                },
+            )
+        )
+    return trades
 
-    outcome = "win" if r_multiple > 0 else "loss" if r_multiple < 0 else "scratch"
-
-    return {
-        "symbol": entry_day["symbol"],
-        "setup_name": setup_name,
-        "signal_ts": _to_ny_timestamp(latest["timestamp"]),
-        "entry_ts": _to_ny_timestamp(entry_day["timestamp"]),
-        "entry_price": round(float(entry_price), 4),
-        "stop_price": round(float(stop_price), 4),
-        "target_price": round(float(target_price), 4),
-        "exit_ts": exit_ts,
-        "exit_price": round(float(exit_price), 4),
-        "exit_reason": exit_reason,
-        "r_multiple": round(float(r_multiple), 4),
-        "outcome": outcome,
-    }
+
+def _write_backtest_result(trades: list[dict], output_path: str) -> BacktestResult:
+    trades_df = pd.DataFrame(trades)
+    trades_df.to_csv(output_path, index=False)
+
+    if trades_df.empty:
+        return BacktestResult(
+            trades_path=output_path,
+            total_trades=0,
+            win_rate=0.0,
+            avg_r=0.0,
+            median_r=0.0,
+            best_r=0.0,
+            worst_r=0.0,
+        )
+
+    total_trades = len(trades_df)
+    win_rate = float((trades_df["outcome"] == "win").mean())
+    avg_r = float(trades_df["r_multiple"].mean())
+    median_r = float(trades_df["r_multiple"].median())
+    best_r = float(trades_df["r_multiple"].max())
+    worst_r = float(trades_df["r_multiple"].min())
+
+    return BacktestResult(
+        trades_path=output_path,
+        total_trades=total_trades,
+        win_rate=win_rate,
+        avg_r=avg_r,
+        median_r=median_r,
+        best_r=best_r,
+        worst_r=worst_r,
+    )
 
 
 def run_backtest(
@@ -148,6 +240,7 @@ def run_backtest(
     setup_name: str = "PrevDayBreakout_D1",
     recent_days: int | None = None,
     regime_filter: dict | None = None,
+    bars: pd.DataFrame | None = None,
 ) -> BacktestResult:
     if risk_multiple <= 0:
         raise ValueError("risk_multiple must be greater than 0")
@@ -164,7 +257,10 @@ def run_backtest(
     if output_dir:
         os.makedirs(output_dir, exist_ok=True)
 
-    bars = client.get_daily_bars(symbol, start, end)
+    if bars is None:
+        bars = client.get_daily_bars(symbol, start, end)
+    else:
+        bars = _slice_bars(bars, start, end)
     if bars is None or bars.empty:
         raise RuntimeError("No historical data returned for backtest.")
 
@@ -177,64 +273,15 @@ def run_backtest(
         if len(df) > keep:
             df = df.iloc[-keep:].reset_index(drop=True)
 
-    trades: list[dict] = []
-    for i in range(1, len(df) - 1):
-        prior = df.iloc[i - 1]
-        latest = df.iloc[i]
-        if regime_filter and regime_filter.get("enabled", False):
-            regime = detect_regime(
-                df.iloc[: i + 1],
-                fast_sma=regime_filter.get("fast_sma", 20),
-                slow_sma=regime_filter.get("slow_sma", 50),
-            )
-            if not regime_allows(setup_name, regime):
-                continue
-        if setup_name == "PrevDayBreakout_D1":
-            if latest["close"] <= prior["high"]:
-                continue
-        elif setup_name == "TwoDayBreakout_D1":
-            if i < 2:
-                continue
-            prior_two = df.iloc[i - 2]
-            if latest["close"] <= max(prior["high"], prior_two["high"]):
-                continue
-        elif setup_name == "MeanReversion_D1":
-            if latest["close"] >= prior["low"]:
-                continue
-        trade = _simulate_trade(df, i, setup_name, risk_multiple, time_stop_days)
-        if trade:
-            trades.append(trade)
-
-    trades_df = pd.DataFrame(trades)
-    trades_df.to_csv(output_path, index=False)
-
-    if trades_df.empty:
-        return BacktestResult(
-            trades_path=output_path,
-            total_trades=0,
-            win_rate=0.0,
-            avg_r=0.0,
-            median_r=0.0,
-            best_r=0.0,
-            worst_r=0.0,
+    signal_indices = _signal_indices(df, setup_name, regime_filter)
+    trades = [
+        trade
+        for _, trade in _simulate_trades(
+            df, signal_indices, setup_name, risk_multiple, time_stop_days
         )
+    ]
 
-    total_trades = len(trades_df)
-    win_rate = float((trades_df["outcome"] == "win").mean())
-    avg_r = float(trades_df["r_multiple"].mean())
-    median_r = float(trades_df["r_multiple"].median())
-    best_r = float(trades_df["r_multiple"].max())
-    worst_r = float(trades_df["r_multiple"].min())
-
-    return BacktestResult(
-        trades_path=output_path,
-        total_trades=total_trades,
-        win_rate=win_rate,
-        avg_r=avg_r,
-        median_r=median_r,
-        best_r=best_r,
-        worst_r=worst_r,
-    )
+    return _write_backtest_result(trades, output_path)
 
 
 def summarize_backtest(trades_path: str) -> dict:
@@ -265,6 +312,67 @@ def summarize_backtest(trades_path: str) -> dict:
     return {"yearly": yearly, "monthly": monthly}
 
 
+class _TrailingScoreIndex:
+    # Tails follow the history order used for ranking: exits sorted by
+    # (symbol, setup_name, exit_ts), so setup-wide and symbol-wide tails are
+    # stitched together from the per-pair windows in that order.
+    def __init__(self, lookback: int) -> None:
+        self.lookback = max(0, lookback)
+        self._pairs: dict[tuple[str, str], deque] = {}
+        self._symbols_by_setup: dict[str, list[str]] = {}
+        self._setups_by_symbol: dict[str, list[str]] = {}
+        self._scores: dict[tuple, float] = {}
+
+    def add(self, symbol: str, setup_name: str, r_multiple: float) -> None:
+        window = self._pairs.get((symbol, setup_name))
+        if window is None:
+            window = deque(maxlen=self.lookback)
+            self._pairs[(symbol, setup_name)] = window
+            insort(self._symbols_by_setup.setdefault(setup_name, []), symbol)
+            insort(self._setups_by_symbol.setdefault(symbol, []), setup_name)
+        window.append(r_multiple)
+        self._scores.pop(("pair", symbol, setup_name), None)
+        self._scores.pop(("setup", setup_name), None)
+        self._scores.pop(("symbol", symbol), None)
+
+    def pair_score(self, symbol: str, setup_name: str) -> float:
+        return self._score(
+            ("pair", symbol, setup_name), [(symbol, setup_name)]
+        )
+
+    def setup_score(self, setup_name: str) -> float:
+        symbols = self._symbols_by_setup.get(setup_name, [])
+        return self._score(
+            ("setup", setup_name), [(symbol, setup_name) for symbol in symbols]
+        )
+
+    def symbol_score(self, symbol: str) -> float:
+        setups = self._setups_by_symbol.get(symbol, [])
+        return self._score(
+            ("symbol", symbol), [(symbol, setup_name) for setup_name in setups]
+        )
+
+    def _score(self, cache_key: tuple, pair_keys: list[tuple[str, str]]) -> float:
+        score = self._scores.get(cache_key)
+        if score is not None:
+            return score
+        chunks: list[list[float]] = []
+        remaining = self.lookback
+        for pair_key in reversed(pair_keys):
+            if remaining <= 0:
+                break
+            values = list(self._pairs.get(pair_key, ()))
+            if len(values) > remaining:
+                values = values[-remaining:]
+            if values:
+                chunks.append(values)
+                remaining -= len(values)
+        tail = [value for chunk in reversed(chunks) for value in chunk]
+        score = float(np.array(tail).sum() / len(tail)) if tail else 0.0
+        self._scores[cache_key] = score
+        return score
+
+
 def run_portfolio_backtest(
     client: AlpacaClient,
     symbol_setups: list[tuple[str, str]],
@@ -303,9 +411,12 @@ def run_portfolio_backtest(
         if output_dir:
             os.makedirs(output_dir, exist_ok=True)
 
+    bars_by_symbol = client.get_daily_bars_many(
+        sorted({symbol for symbol, _ in symbol_setups}), start, end
+    )
     candidates: list[dict] = []
     for symbol, setup_name in sorted(symbol_setups):
-        bars = client.get_daily_bars(symbol, start, end)
+        bars = bars_by_symbol.get(symbol)
         if bars is None or bars.empty:
             continue
         df = bars.reset_index()
@@ -317,20 +428,10 @@ def run_portfolio_backtest(
                 df = df.iloc[-keep:].reset_index(drop=True)
         df["symbol"] = symbol
 
-        for i in range(1, len(df) - 1):
-            if regime_filter and regime_filter.get("enabled", False):
-                regime = detect_regime(
-                    df.iloc[: i + 1],
-                    fast_sma=regime_filter.get("fast_sma", 20),
-                    slow_sma=regime_filter.get("slow_sma", 50),
-                )
-                if not regime_allows(setup_name, regime):
-                    continue
-            if not _signal_triggered(df, i, setup_name):
-                continue
-            trade = _simulate_trade(df, i, setup_name, risk_multiple, time_stop_days)
-            if not trade:
-                continue
+        signal_indices = _signal_indices(df, setup_name, regime_filter)
+        for i, trade in _simulate_trades(
+            df, signal_indices, setup_name, risk_multiple, time_stop_days
+        ):
             entry_price = float(trade["entry_price"])
             stop_price = float(trade["stop_price"])
             candidates.append(
@@ -379,8 +480,11 @@ def run_portfolio_backtest(
             ["symbol", "setup_name", "exit_ts", "r_multiple"]
         ]
         .dropna(subset=["exit_ts", "r_multiple"])
-        .sort_values(["symbol", "setup_name", "exit_ts"])
+        .sort_values("exit_ts", kind="stable")
     )
+    history_rows = list(history.itertuples(index=False))
+    history_pos = 0
+    scores = _TrailingScoreIndex(score_lookback_trades)
 
     executed: list[dict] = []
     skipped: list[dict] = []
@@ -397,38 +501,23 @@ def run_portfolio_backtest(
         open_exposure = sum(row["entry_notional_usd"] for row in active_positions)
         open_risk = sum(row["risk_to_stop_usd"] for row in active_positions)
 
+        while (
+            history_pos < len(history_rows)
+            and history_rows[history_pos].exit_ts < entry_ts
+        ):
+            exit_row = history_rows[history_pos]
+            scores.add(exit_row.symbol, exit_row.setup_name, exit_row.r_multiple)
+            history_pos += 1
+
         ranked_rows: list[dict] = []
         for _, row in group.iterrows():
             score = 0.0
             if rank_by == "trailing_avg_r":
-                hist = history[
-                    (history["symbol"] == row["symbol"])
-                    & (history["setup_name"] == row["setup_name"])
-                    & (history["exit_ts"] < entry_ts)
-                ]["r_multiple"].tail(score_lookback_trades)
-                score = float(hist.mean()) if not hist.empty else 0.0
+                score = scores.pair_score(row["symbol"], row["setup_name"])
             elif rank_by == "trailing_blended_avg_r":
-                pair_hist = history[
-                    (history["symbol"] == row["symbol"])
-                    & (history["setup_name"] == row["setup_name"])
-                    & (history["exit_ts"] < entry_ts)
-                ]["r_multiple"].tail(score_lookback_trades)
-                setup_hist = history[
-                    (history["setup_name"] == row["setup_name"])
-                    & (history["exit_ts"] < entry_ts)
-                ]["r_multiple"].tail(score_lookback_trades)
-                symbol_hist = history[
-                    (history["symbol"] == row["symbol"])
-                    & (history["exit_ts"] < entry_ts)
-                ]["r_multiple"].tail(score_lookback_trades)
-
-                pair_score = float(pair_hist.mean()) if not pair_hist.empty else 0.0
-                setup_score = (
-                    float(setup_hist.mean()) if not setup_hist.empty else 0.0
-                )
-                symbol_score = (
-                    float(symbol_hist.mean()) if not symbol_hist.empty else 0.0
-                )
+                pair_score = scores.pair_score(row["symbol"], row["setup_name"])
+                setup_score = scores.setup_score(row["setup_name"])
+                symbol_score = scores.symbol_score(row["symbol"])
                 # Blend pair/setup/symbol expectancy to reduce sparse-history ranking noise.
                 score = 0.5 * pair_score + 0.25 * setup_score + 0.25 * symbol_score
             ranked_rows.append(
@@ -671,3 +760,90 @@ def run_recent_backtest(
         recent_days=recent_days,
         regime_filter=regime_filter,
     )
+
+
+def run_recent_backtests(
+    client: AlpacaClient,
+    symbol: str,
+    windows: list[int],
+    risk_multiple: float,
+    time_stop_days: int,
+    output_paths: dict[int, str],
+    setup_name: str,
+    regime_filter: dict | None = None,
+    bars: pd.DataFrame | None = None,
+) -> dict[int, BacktestResult]:
+    if risk_multiple <= 0:
+        raise ValueError("risk_multiple must be greater than 0")
+    if time_stop_days < 1:
+        raise ValueError("time_stop_days must be >= 1")
+    if setup_name not in {
+        "PrevDayBreakout_D1",
+        "MeanReversion_D1",
+        "TwoDayBreakout_D1",
+    }:
+        raise ValueError(f"Unsupported setup_name: {setup_name}")
+    if not windows:
+        return {}
+
+    now = pd.Timestamp.now(tz="UTC")
+    end = now.date().isoformat()
+    starts = {
+        window: (now - pd.Timedelta(days=window * 3)).date().isoformat()
+        for window in windows
+    }
+    longest_start = min(starts.values())
+    if bars is None:
+        bars = client.get_daily_bars(symbol, longest_start, end)
+    else:
+        bars = _slice_bars(bars, longest_start, end)
+    if bars is None or bars.empty:
+        raise RuntimeError("No historical data returned for backtest.")
+
+    df = bars.reset_index()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+    df = df.sort_values("timestamp").reset_index(drop=True)
+    df["symbol"] = symbol
+
+    # Each window's frame is a suffix of the longest one, and trades never
+    # interact, so one simulation over every raw signal covers all windows.
+    signal_indices = np.flatnonzero(setup_signal_mask(df, setup_name))
+    all_trades = _simulate_trades(
+        df, signal_indices, setup_name, risk_multiple, time_stop_days
+    )
+    # Signals need one (two for TwoDayBreakout) prior bars inside the frame.
+    first_signal = 2 if setup_name == "TwoDayBreakout_D1" else 1
+
+    results: dict[int, BacktestResult] = {}
+    for window in windows:
+        in_range = int(
+            (df["timestamp"] >= pd.to_datetime(starts[window], utc=True)).sum()
+        )
+        frame_len = min(in_range, window + 2)
+        if frame_len == 0:
+            raise RuntimeError("No historical data returned for backtest.")
+        offset = len(df) - frame_len
+        trades = [
+            (index, trade)
+            for index, trade in all_trades
+            if index >= offset + first_signal
+        ]
+        if regime_filter and regime_filter.get("enabled", False):
+            regimes = regime_series(
+                df.iloc[offset:],
+                fast_sma=regime_filter.get("fast_sma", 20),
+                slow_sma=regime_filter.get("slow_sma", 50),
+            ).to_numpy()
+            trades = [
+                (index, trade)
+                for index, trade in trades
+                if regime_allows(setup_name, regimes[index - offset])
+            ]
+        output_path = output_paths[window]
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        results[window] = _write_backtest_result(
+            [trade for _, trade in trades], output_path
+        )
+    return results
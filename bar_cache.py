@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import json
+import os
+from datetime import date as date_cls
+from datetime import timedelta
+
+import pandas as pd
+
+
+NY_TZ = "America/New_York"
+DEFAULT_READY_TIME = "16:20"
+MARKET_OPEN_TIME = "09:30"
+BAR_COLUMNS = ["open", "high", "low", "close", "volume", "trade_count", "vwap"]
+
+
+def daily_bar_ready(now: pd.Timestamp, ready_time: str = DEFAULT_READY_TIME) -> bool:
+    now_ny = now.tz_convert(NY_TZ)
+    return now_ny.time() >= pd.Timestamp(ready_time).time()
+
+
+def market_opened(now: pd.Timestamp, open_time: str = MARKET_OPEN_TIME) -> bool:
+    now_ny = now.tz_convert(NY_TZ)
+    return now_ny.time() >= pd.Timestamp(open_time).time()
+
+
+def last_completed_session_date(
+    now: pd.Timestamp, ready_time: str = DEFAULT_READY_TIME
+) -> date_cls:
+    today = now.tz_convert(NY_TZ).date()
+    if daily_bar_ready(now, ready_time):
+        return today
+    return today - timedelta(days=1)
+
+
+def ny_day_start(day: date_cls) -> pd.Timestamp:
+    return pd.Timestamp(day, tz=NY_TZ).tz_convert("UTC")
+
+
+def ny_day_end(day: date_cls) -> pd.Timestamp:
+    return ny_day_start(day + timedelta(days=1)) - pd.Timedelta(seconds=1)
+
+
+def ny_date(value: pd.Timestamp) -> date_cls:
+    return value.tz_convert(NY_TZ).date()
+
+
+class DailyBarCache:
+    def __init__(self, root: str) -> None:
+        self.root = root
+        # Frames already read by this process, keyed by symbol and reused
+        # while both files keep the same mtime (see `main.py serve`).
+        self._loaded: dict[str, tuple[tuple, pd.DataFrame, dict]] = {}
+
+    def _bars_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.csv")
+
+    def _meta_path(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.json")
+
+    def _stamp(self, symbol: str) -> tuple | None:
+        try:
+            meta_stat = os.stat(self._meta_path(symbol))
+            bars_stat = os.stat(self._bars_path(symbol))
+        except OSError:
+            return None
+        return (
+            meta_stat.st_mtime_ns,
+            meta_stat.st_size,
+            bars_stat.st_mtime_ns,
+            bars_stat.st_size,
+        )
+
+    def load(self, symbol: str) -> tuple[pd.DataFrame, dict]:
+        stamp = self._stamp(symbol)
+        loaded = self._loaded.get(symbol.upper())
+        if stamp is not None and loaded is not None and loaded[0] == stamp:
+            return loaded[1], dict(loaded[2])
+        df, meta = self._read(symbol)
+        if stamp is not None and stamp == self._stamp(symbol):
+            self._loaded[symbol.upper()] = (stamp, df, dict(meta))
+        return df, meta
+
+    def _read(self, symbol: str) -> tuple[pd.DataFrame, dict]:
+        meta: dict = {}
+        meta_path = self._meta_path(symbol)
+        bars_path = self._bars_path(symbol)
+        if not os.path.exists(meta_path) or not os.path.exists(bars_path):
+            return _empty_bars(), meta
+        try:
+            with open(meta_path, "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            df = pd.read_csv(bars_path)
+        except (OSError, ValueError, pd.errors.EmptyDataError):
+            return _empty_bars(), {}
+        if df.empty or "timestamp" not in df.columns:
+            return _empty_bars(), meta
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        df = df.set_index("timestamp").sort_index()
+        return df, meta
+
+    def store(self, symbol: str, df: pd.DataFrame, meta: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        bars_path = self._bars_path(symbol)
+        meta_path = self._meta_path(symbol)
+        out = df.copy()
+        out.index.name = "timestamp"
+        out = out.reset_index()
+        out["timestamp"] = out["timestamp"].map(lambda value: value.isoformat())
+        bars_tmp = f"{bars_path}.{os.getpid()}.tmp"
+        meta_tmp = f"{meta_path}.{os.getpid()}.tmp"
+        out.to_csv(bars_tmp, index=False)
+        with open(meta_tmp, "w", encoding="utf-8") as file:
+            json.dump(meta, file, indent=2, sort_keys=True)
+        os.replace(bars_tmp, bars_path)
+        os.replace(meta_tmp, meta_path)
+        self._loaded.pop(symbol.upper(), None)
+
+
+def merge_bars(existing: pd.DataFrame, fetched: pd.DataFrame | None) -> pd.DataFrame:
+    if fetched is None or fetched.empty:
+        return existing
+    if existing.empty:
+        merged = fetched
+    else:
+        merged = pd.concat([existing, fetched])
+    merged = merged[~merged.index.duplicated(keep="last")]
+    return merged.sort_index()
+
+
+def _empty_bars() -> pd.DataFrame:
+    index = pd.DatetimeIndex([], tz="UTC", name="timestamp")
+    return pd.DataFrame(columns=BAR_COLUMNS, index=index, dtype="float64")
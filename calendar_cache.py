@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date as date_cls
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+
+HISTORY_DAYS = 5 * 366
+FUTURE_DAYS = 366
+REFRESH_AFTER = timedelta(days=7)
+
+
+class TradingCalendarCache:
+    # The exchange calendar is fetched as one multi-year range and kept as a
+    # sorted list of session ordinals, so counting the sessions between two
+    # dates is two bisects (the insertion index is the prefix count).
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._sessions: list[int] = []
+        self._start: date_cls | None = None
+        self._end: date_cls | None = None
+        self._fetched_at: datetime | None = None
+        self._loaded = False
+
+    def count_sessions(
+        self,
+        fetch: Callable[[str, str], list],
+        start_date: date_cls,
+        end_date: date_cls,
+    ) -> int:
+        if end_date < start_date:
+            return 0
+        with self._lock:
+            if not self._loaded:
+                self._read()
+                self._loaded = True
+            if not self._covers(start_date, end_date) or self._stale():
+                self._refresh(fetch, start_date, end_date)
+            sessions = self._sessions
+        return bisect_right(sessions, end_date.toordinal()) - bisect_left(
+            sessions, start_date.toordinal()
+        )
+
+    def _covers(self, start_date: date_cls, end_date: date_cls) -> bool:
+        return (
+            self._start is not None
+            and self._end is not None
+            and self._start <= start_date
+            and end_date <= self._end
+        )
+
+    def _stale(self) -> bool:
+        return (
+            self._fetched_at is None
+            or datetime.now(timezone.utc) - self._fetched_at > REFRESH_AFTER
+        )
+
+    def _refresh(
+        self,
+        fetch: Callable[[str, str], list],
+        start_date: date_cls,
+        end_date: date_cls,
+    ) -> None:
+        today = datetime.now(timezone.utc).date()
+        range_start = min(start_date, today - timedelta(days=HISTORY_DAYS))
+        range_end = max(end_date, today + timedelta(days=FUTURE_DAYS))
+        try:
+            calendar = fetch(range_start.isoformat(), range_end.isoformat())
+        except Exception:
+            # A stale calendar that still covers the range beats no answer.
+            if self._covers(start_date, end_date):
+                return
+            raise
+        self._sessions = sorted({day.date.toordinal() for day in calendar})
+        self._start = range_start
+        self._end = range_end
+        self._fetched_at = datetime.now(timezone.utc)
+        self._write()
+
+    def _read(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            sessions = sorted(
+                date_cls.fromisoformat(value).toordinal()
+                for value in data["sessions"]
+            )
+            start = date_cls.fromisoformat(data["start"])
+            end = date_cls.fromisoformat(data["end"])
+            fetched_at = datetime.fromisoformat(data["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        self._sessions = sessions
+        self._start = start
+        self._end = end
+        self._fetched_at = fetched_at
+
+    def _write(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "fetched_at": self._fetched_at.isoformat() if self._fetched_at else "",
+            "start": self._start.isoformat() if self._start else "",
+            "end": self._end.isoformat() if self._end else "",
+            "sessions": [
+                date_cls.fromordinal(value).isoformat() for value in self._sessions
+            ],
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+        os.replace(tmp_path, self.path)
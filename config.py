@@ -44,11 +44,21 @@ class AppConfig:
     time_stop_days: int
     time_stop_min_r: float
     run_stale_days: int
+    bar_cache_dir: str
+    daily_bar_ready_time: str
+    backtest_gate_cache_path: str
+    order_cache_path: str
+    alpaca_max_concurrency: int
+    calendar_cache_path: str
 
     @classmethod
-    def from_env(cls) -> "AppConfig":
+    def from_env(cls, config_path: str | None = None) -> "AppConfig":
         load_dotenv()
-        config_path = os.getenv("CONFIG_PATH", "config.json").strip() or "config.json"
+        config_path = (
+            config_path
+            or os.getenv("CONFIG_PATH", "config.json").strip()
+            or "config.json"
+        )
         config_data = {}
         config_file = Path(config_path)
         if config_file.exists():
@@ -115,6 +125,37 @@ class AppConfig:
                 str(config_data.get("run_stale_days", 2)),
             )
         )
+        bar_cache_dir = os.getenv(
+            "BAR_CACHE_DIR",
+            config_data.get("bar_cache_dir", "data/bar_cache"),
+        ).strip()
+        daily_bar_ready_time = os.getenv(
+            "DAILY_BAR_READY_TIME",
+            config_data.get("daily_bar_ready_time", "16:20"),
+        ).strip() or "16:20"
+        backtest_gate_cache_path = os.getenv(
+            "BACKTEST_GATE_CACHE_PATH",
+            config_data.get(
+                "backtest_gate_cache_path", "data/backtest_gate_cache.json"
+            ),
+        ).strip()
+        order_cache_path = os.getenv(
+            "ORDER_CACHE_PATH",
+            config_data.get("order_cache_path", "data/order_cache.json"),
+        ).strip()
+        calendar_cache_path = os.getenv(
+            "CALENDAR_CACHE_PATH",
+            config_data.get("calendar_cache_path", "data/trading_calendar.json"),
+        ).strip()
+        alpaca_max_concurrency = max(
+            1,
+            int(
+                os.getenv(
+                    "ALPACA_MAX_CONCURRENCY",
+                    str(config_data.get("alpaca_max_concurrency", 4)),
+                )
+            ),
+        )
         enabled_setups_raw = os.getenv("ENABLED_SETUPS", "").strip()
         if enabled_setups_raw:
             enabled_setups = [
@@ -307,6 +348,12 @@ class AppConfig:
             time_stop_days=time_stop_days,
             time_stop_min_r=time_stop_min_r,
             run_stale_days=run_stale_days,
+            bar_cache_dir=bar_cache_dir,
+            daily_bar_ready_time=daily_bar_ready_time,
+            backtest_gate_cache_path=backtest_gate_cache_path,
+            order_cache_path=order_cache_path,
+            alpaca_max_concurrency=alpaca_max_concurrency,
+            calendar_cache_path=calendar_cache_path,
             watch_only_symbols=watch_only_symbols,
             universe_path=universe_path,
             regime_filter_enabled=regime_filter_enabled,
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+
+from backtest import BacktestResult
+
+
+def gate_cache_key(
+    symbol: str,
+    setup_name: str,
+    gate_days: int,
+    risk_multiple: float,
+    time_stop_days: int,
+    regime_filter: dict | None,
+    as_of: str,
+) -> str:
+    if regime_filter and regime_filter.get("enabled", False):
+        regime = (
+            f"regime={regime_filter.get('fast_sma', 20)}/"
+            f"{regime_filter.get('slow_sma', 50)}"
+        )
+    else:
+        regime = "regime=off"
+    return "|".join(
+        [
+            symbol.upper(),
+            setup_name,
+            f"{gate_days}d",
+            f"r={risk_multiple:g}",
+            f"tsd={time_stop_days}",
+            regime,
+            as_of,
+        ]
+    )
+
+
+class BacktestGateCache:
+    # Entries are only ever valid for one as_of date, so every store drops
+    # the ones left over from earlier bar dates.
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: dict[str, dict] = {}
+
+    def get(self, key: str) -> BacktestResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._entries.update(self._read())
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            return BacktestResult(**entry["result"])
+        except (KeyError, TypeError):
+            return None
+
+    def store(self, key: str, as_of: str, result: BacktestResult) -> None:
+        entries = self._read()
+        entries.update(self._entries)
+        entries[key] = {"as_of": as_of, "result": asdict(result)}
+        entries = {
+            entry_key: entry
+            for entry_key, entry in entries.items()
+            if entry.get("as_of") == as_of
+        }
+        self._entries = entries
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
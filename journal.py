@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import csv
-import os
+import re
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, Iterator
 from uuid import uuid4
 
-from alpaca_client import AlpacaOrderResult
+from storage import open_store
+
+if TYPE_CHECKING:
+    from alpaca_client import AlpacaOrderResult
 
 
 FIELDNAMES = [
@@ -24,6 +29,8 @@ FIELDNAMES = [
     "invalidation_reason",
     "stop_loss_logic",
     "take_profit_logic",
+    "stop_price",
+    "target_r",
     "market_context",
     "emotional_state",
     "outcome",
@@ -71,6 +78,8 @@ SIGNAL_QUEUE_FIELDNAMES = [
     "invalidation_reason",
     "stop_loss_logic",
     "take_profit_logic",
+    "stop_price",
+    "target_r",
     "market_context",
     "emotional_state",
     "order_type",
@@ -106,74 +115,209 @@ EXECUTION_LEDGER_FIELDNAMES = [
 ]
 
 
-def init_journal(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
-        ensure_schema(journal_path)
+STORE_FIELDNAMES = {
+    "journal": FIELDNAMES,
+    "no_trade_journal": NO_TRADE_FIELDNAMES,
+    "pending_reviews": PENDING_REVIEW_FIELDNAMES,
+    "review_queue": REVIEW_QUEUE_FIELDNAMES,
+    "signal_queue": SIGNAL_QUEUE_FIELDNAMES,
+    "execution_ledger": EXECUTION_LEDGER_FIELDNAMES,
+}
+
+
+STOP_PRICE_PATTERN = r"\(([-+]?[0-9]*\.?[0-9]+)\)"
+R_MULTIPLE_PATTERN = r"([-+]?[0-9]*\.?[0-9]+)\s*R"
+
+
+def extract_stop_price(stop_loss_logic: str) -> float | None:
+    if not stop_loss_logic:
+        return None
+    match = re.search(STOP_PRICE_PATTERN, stop_loss_logic)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+def extract_r_multiple(take_profit_logic: str) -> float | None:
+    if not take_profit_logic:
+        return None
+    match = re.search(R_MULTIPLE_PATTERN, take_profit_logic, re.IGNORECASE)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+def extract_price_in_parentheses(value: str) -> float | None:
+    if not value:
+        return None
+    match = re.search(STOP_PRICE_PATTERN, value)
+    if not match:
+        return None
+    return float(match.group(1))
+
+
+def _level(value: object) -> float | None:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def row_stop_price(row: dict) -> float | None:
+    # Rows written before stop_price existed (and not backfilled) fall back
+    # to the free-text field.
+    stop_price = _level(row.get("stop_price"))
+    if stop_price is not None:
+        return stop_price
+    return extract_stop_price(row.get("stop_loss_logic") or "")
+
+
+def row_target_r(row: dict) -> float | None:
+    # An absolute target in take_profit_logic wins over an R multiple, so
+    # only an explicit target_r or R-only text yields one.
+    target_r = _level(row.get("target_r"))
+    if target_r is not None:
+        return target_r
+    take_profit_logic = row.get("take_profit_logic") or ""
+    if extract_price_in_parentheses(take_profit_logic) is not None:
+        return None
+    return extract_r_multiple(take_profit_logic)
+
+
+def _backfill_levels(store, key_field: str) -> None:
+    # One-time migration, run when ensure_schema has just added the columns.
+    rows = list(store.read_rows())
+    changed = []
+    for row in rows:
+        stop_price = row_stop_price(row)
+        target_r = row_target_r(row)
+        if stop_price is None and target_r is None:
+            continue
+        row["stop_price"] = "" if stop_price is None else stop_price
+        row["target_r"] = "" if target_r is None else target_r
+        changed.append(row)
+    store.save_rows(rows, changed, key_field)
+
+
+def _init_level_store(path: str, fieldnames: list[str], key_field: str) -> None:
+    store = open_store(path, fieldnames)
+    if not store.exists():
+        store.create()
         return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
-        writer.writeheader()
+    added = store.ensure_schema()
+    if "stop_price" in added or "target_r" in added:
+        _backfill_levels(store, key_field)
+
+
+class JournalStore:
+    # One load of the trade journal shared by a command. Mutations stay in
+    # memory until flush(), which persists every dirty row in one write.
+    def __init__(self, journal_path: str) -> None:
+        self.path = journal_path
+        self._store = open_store(journal_path, FIELDNAMES)
+        self.rows: list[dict] = list(self._store.read_rows())
+        self._dirty: dict[int, dict] = {}
+        self._added: list[dict] = []
+        self._by_trade_id: dict[str, dict] | None = None
+        self._by_order_id: dict[str, dict] = {}
+        self._open_by_symbol: dict[str, list[dict]] = {}
+        self._state_stale = True
+
+    def _index_state(self) -> None:
+        # order_id and exit_ts change under sync, so these indexes are rebuilt
+        # lazily after mutations; trade_id never changes once written.
+        if not self._state_stale:
+            return
+        self._by_order_id = {}
+        self._open_by_symbol = {}
+        for row in self.rows:
+            if row.get("order_id"):
+                self._by_order_id.setdefault(row["order_id"], row)
+            if not row.get("exit_ts"):
+                self._open_by_symbol.setdefault(row.get("symbol") or "", []).append(
+                    row
+                )
+        self._state_stale = False
+
+    def get(self, trade_id: str) -> dict | None:
+        if self._by_trade_id is None:
+            self._by_trade_id = {}
+            for row in self.rows:
+                self._by_trade_id.setdefault(row.get("trade_id") or "", row)
+        return self._by_trade_id.get(trade_id)
+
+    def find_by_order_id(self, order_id: str) -> dict | None:
+        self._index_state()
+        return self._by_order_id.get(order_id)
+
+    def open_rows(self, symbol: str | None = None) -> list[dict]:
+        if symbol is not None:
+            self._index_state()
+            return list(self._open_by_symbol.get(symbol, []))
+        return [row for row in self.rows if not row.get("exit_ts")]
+
+    def append(self, row: dict) -> None:
+        self.rows.append(row)
+        self._added.append(row)
+        if self._by_trade_id is not None:
+            self._by_trade_id.setdefault(row.get("trade_id") or "", row)
+        self._state_stale = True
+
+    def mark_dirty(self, row: dict) -> None:
+        if not any(added is row for added in self._added):
+            self._dirty[id(row)] = row
+        self._state_stale = True
+
+    def flush(self) -> bool:
+        if not self._dirty and not self._added:
+            return False
+        self._store.save_rows(
+            self.rows, list(self._dirty.values()), "trade_id", self._added
+        )
+        self._dirty = {}
+        self._added = []
+        return True
 
 
-def init_no_trade_journal(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
+@contextmanager
+def _journal_store(journal: str | JournalStore) -> Iterator[JournalStore]:
+    if isinstance(journal, JournalStore):
+        yield journal
         return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=NO_TRADE_FIELDNAMES)
-        writer.writeheader()
+    store = JournalStore(journal)
+    yield store
+    store.flush()
+
+
+def init_journal(journal_path: str) -> None:
+    _init_level_store(journal_path, FIELDNAMES, "trade_id")
+
+
+def init_no_trade_journal(journal_path: str) -> None:
+    open_store(journal_path, NO_TRADE_FIELDNAMES).create()
 
 
 def init_pending_reviews(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
-        return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=PENDING_REVIEW_FIELDNAMES)
-        writer.writeheader()
+    open_store(journal_path, PENDING_REVIEW_FIELDNAMES).create()
 
 
 def init_review_queue(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
-        return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=REVIEW_QUEUE_FIELDNAMES)
-        writer.writeheader()
+    open_store(journal_path, REVIEW_QUEUE_FIELDNAMES).create()
 
 
 def init_signal_queue(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
-        return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=SIGNAL_QUEUE_FIELDNAMES)
-        writer.writeheader()
+    _init_level_store(journal_path, SIGNAL_QUEUE_FIELDNAMES, "signal_id")
 
 
 def init_execution_ledger(journal_path: str) -> None:
-    dir_name = os.path.dirname(journal_path)
-    if dir_name:
-        os.makedirs(dir_name, exist_ok=True)
-    if os.path.exists(journal_path):
-        return
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=EXECUTION_LEDGER_FIELDNAMES)
-        writer.writeheader()
+    open_store(journal_path, EXECUTION_LEDGER_FIELDNAMES).create()
 
 
-def log_entry(journal_path: str, idea: dict, order: AlpacaOrderResult) -> str:
+def log_entry(
+    journal_path: str | JournalStore, idea: dict, order: AlpacaOrderResult
+) -> str:
     trade_id = str(uuid4())
     entry_price = order.filled_avg_price or order.limit_price
     entry_ts = order.created_at or datetime.now(timezone.utc).isoformat()
@@ -193,6 +337,8 @@ def log_entry(journal_path: str, idea: dict, order: AlpacaOrderResult) -> str:
         "invalidation_reason": idea["invalidation_reason"],
         "stop_loss_logic": idea["stop_loss_logic"],
         "take_profit_logic": idea["take_profit_logic"],
+        "stop_price": idea.get("stop_price", ""),
+        "target_r": idea.get("target_r", ""),
         "market_context": idea["market_context"],
         "emotional_state": idea["emotional_state"],
         "outcome": "",
@@ -203,12 +349,15 @@ def log_entry(journal_path: str, idea: dict, order: AlpacaOrderResult) -> str:
         "improvement_idea": "",
     }
 
-    append_row(journal_path, row)
+    if isinstance(journal_path, JournalStore):
+        journal_path.append(row)
+    else:
+        append_row(journal_path, row)
     return trade_id
 
 
 def log_exit(
-    journal_path: str,
+    journal_path: str | JournalStore,
     trade_id: str,
     exit_ts: str,
     exit_price: float,
@@ -220,74 +369,112 @@ def log_exit(
     improvement_idea: str,
     exit_order_id: str = "",
 ) -> None:
-    rows = list(read_rows(journal_path))
-    updated = False
-    for row in rows:
-        if row["trade_id"] == trade_id:
-            row["exit_ts"] = exit_ts
-            row["exit_price"] = exit_price
-            if exit_order_id:
-                row["exit_order_id"] = exit_order_id
-            row["outcome"] = outcome
-            row["r_multiple"] = r_multiple
-            row["exit_reason"] = exit_reason
-            row["what_went_right"] = what_went_right
-            row["what_went_wrong"] = what_went_wrong
-            row["improvement_idea"] = improvement_idea
-            updated = True
-            break
-
-    if not updated:
+    changes = {
+        "exit_ts": exit_ts,
+        "exit_price": exit_price,
+        "outcome": outcome,
+        "r_multiple": r_multiple,
+        "exit_reason": exit_reason,
+        "what_went_right": what_went_right,
+        "what_went_wrong": what_went_wrong,
+        "improvement_idea": improvement_idea,
+    }
+    if exit_order_id:
+        changes["exit_order_id"] = exit_order_id
+    if isinstance(journal_path, JournalStore):
+        row = journal_path.get(trade_id)
+        if row is None:
+            raise RuntimeError(f"Trade ID not found: {trade_id}")
+        row.update(changes)
+        journal_path.mark_dirty(row)
+        return
+    updated = open_store(journal_path, FIELDNAMES).update(
+        "trade_id", trade_id, changes
+    )
+    if updated is None:
         raise RuntimeError(f"Trade ID not found: {trade_id}")
 
-    write_rows(journal_path, rows)
-
 
 def append_row(journal_path: str, row: dict) -> None:
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
-        writer.writerow(row)
+    open_store(journal_path, FIELDNAMES).append(row)
 
 
-def read_rows(journal_path: str) -> Iterable[dict]:
-    with open(journal_path, "r", newline="", encoding="utf-8") as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            yield row
+def read_rows(journal_path: str | JournalStore) -> Iterable[dict]:
+    if isinstance(journal_path, JournalStore):
+        yield from journal_path.rows
+        return
+    yield from open_store(journal_path, FIELDNAMES).read_rows()
 
 
 def write_rows(journal_path: str, rows: Iterable[dict]) -> None:
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=FIELDNAMES)
-        writer.writeheader()
-        writer.writerows(rows)
+    open_store(journal_path, FIELDNAMES).write_rows(rows)
 
 
 def ensure_schema(journal_path: str) -> None:
-    with open(journal_path, "r", newline="", encoding="utf-8") as file:
-        reader = csv.reader(file)
-        header = next(reader, [])
-
-    if not header:
-        return
-
-    missing = [field for field in FIELDNAMES if field not in header]
-    if not missing:
-        return
-
-    rows = list(read_rows(journal_path))
-    for row in rows:
-        for field in missing:
-            row[field] = ""
-
-    write_rows(journal_path, rows)
-
-
-def sync_entry_prices(journal_path: str, orders: list[dict]) -> int:
-    rows = list(read_rows(journal_path))
+    open_store(journal_path, FIELDNAMES).ensure_schema()
+
+
+class _OrderIndex:
+    # Orders grouped per symbol by created_at and per (symbol, side) by
+    # filled_at, each sorted by (timestamp, list position) so a bisect lands
+    # on the same order min() over the original list would pick.
+    def __init__(self, orders: list[dict]) -> None:
+        created: dict[str, list[tuple]] = {}
+        fills: dict[tuple[str, str], list[tuple]] = {}
+        for position, order in enumerate(orders):
+            if order.get("created_at"):
+                created.setdefault(order["symbol"], []).append(
+                    (order["created_at"], position, order)
+                )
+            if order.get("filled_at") and order.get("filled_avg_price") is not None:
+                fills.setdefault((order["symbol"], order.get("side")), []).append(
+                    (order["filled_at"], position, order)
+                )
+        self._created = {
+            key: _sorted_entries(entries) for key, entries in created.items()
+        }
+        self._fills = {key: _sorted_entries(entries) for key, entries in fills.items()}
+
+    def nearest_created(self, symbol: str, ts: datetime) -> dict | None:
+        keys, entries = self._created.get(symbol, ([], []))
+        if not keys:
+            return None
+        pos = bisect_left(keys, ts)
+        best = None
+        for index in (pos - 1, pos):
+            if not 0 <= index < len(keys):
+                continue
+            # First entry of this timestamp group has the lowest position.
+            first = bisect_left(keys, keys[index])
+            distance = abs((keys[first] - ts).total_seconds())
+            candidate = (distance, entries[first][1], entries[first][2])
+            if best is None or candidate[:2] < best[:2]:
+                best = candidate
+        return best[2]
+
+    def earliest_fill(self, symbol: str, side: str, after: datetime) -> dict | None:
+        keys, entries = self._fills.get((symbol, side), ([], []))
+        pos = bisect_left(keys, after)
+        if pos >= len(keys):
+            return None
+        return entries[pos][2]
+
+
+def _sorted_entries(entries: list[tuple]) -> tuple[list, list[tuple]]:
+    entries.sort(key=lambda entry: (entry[0], entry[1]))
+    return [entry[0] for entry in entries], entries
+
+
+def sync_entry_prices(journal_path: str | JournalStore, orders: list[dict]) -> int:
+    with _journal_store(journal_path) as journal:
+        return _sync_entry_prices(journal, orders)
+
+
+def _sync_entry_prices(journal: JournalStore, orders: list[dict]) -> int:
     updated = 0
     orders_by_id = {order["order_id"]: order for order in orders}
-    for row in rows:
+    order_index = _OrderIndex(orders)
+    for row in journal.rows:
         order_id = row.get("order_id")
         if not order_id and row.get("entry_ts"):
             try:
@@ -295,22 +482,11 @@ def sync_entry_prices(journal_path: str, orders: list[dict]) -> int:
             except ValueError:
                 entry_ts = None
             if entry_ts:
-                candidates = [
-                    order
-                    for order in orders
-                    if order["symbol"] == row.get("symbol")
-                    and order.get("created_at")
-                ]
-                if candidates:
-                    nearest = min(
-                        candidates,
-                        key=lambda order: abs(
-                            (order["created_at"] - entry_ts).total_seconds()
-                        ),
-                    )
-                    if abs((nearest["created_at"] - entry_ts).total_seconds()) <= 120:
-                        row["order_id"] = nearest["order_id"]
-                        order_id = nearest["order_id"]
+                nearest = order_index.nearest_created(row.get("symbol"), entry_ts)
+                if nearest and abs((nearest["created_at"] - entry_ts).total_seconds()) <= 120:
+                    row["order_id"] = nearest["order_id"]
+                    order_id = nearest["order_id"]
+                    journal.mark_dirty(row)
         if row.get("entry_price"):
             continue
         order = orders_by_id.get(order_id) if order_id else None
@@ -320,19 +496,20 @@ def sync_entry_prices(journal_path: str, orders: list[dict]) -> int:
         if filled_avg_price is None:
             continue
         row["entry_price"] = filled_avg_price
+        journal.mark_dirty(row)
         updated += 1
-
-    if updated:
-        write_rows(journal_path, rows)
     return updated
 
 
-def sync_exits(journal_path: str, orders: list[dict]) -> int:
-    rows = list(read_rows(journal_path))
+def sync_exits(journal_path: str | JournalStore, orders: list[dict]) -> list[str]:
+    with _journal_store(journal_path) as journal:
+        return _sync_exits(journal, orders)
+
+
+def _sync_exits(journal: JournalStore, orders: list[dict]) -> list[str]:
+    order_index = _OrderIndex(orders)
     updated_trade_ids = []
-    for row in rows:
-        if row.get("exit_ts"):
-            continue
+    for row in journal.open_rows():
         entry_ts_raw = row.get("entry_ts")
         if not entry_ts_raw:
             continue
@@ -343,27 +520,16 @@ def sync_exits(journal_path: str, orders: list[dict]) -> int:
         if entry_ts.tzinfo is None:
             entry_ts = entry_ts.replace(tzinfo=timezone.utc)
         side_needed = "sell" if row.get("direction") == "long" else "buy"
-        candidates = [
-            order
-            for order in orders
-            if order["symbol"] == row.get("symbol")
-            and order.get("side") == side_needed
-            and order.get("filled_at")
-            and order["filled_at"] >= entry_ts
-            and order.get("filled_avg_price") is not None
-        ]
-        if not candidates:
+        earliest = order_index.earliest_fill(row.get("symbol"), side_needed, entry_ts)
+        if not earliest:
             continue
-        earliest = min(candidates, key=lambda order: order["filled_at"])
         row["exit_ts"] = earliest["filled_at"].isoformat()
         row["exit_price"] = earliest["filled_avg_price"]
         row["exit_order_id"] = earliest["order_id"]
         if not row.get("exit_reason"):
             row["exit_reason"] = "auto_sync"
+        journal.mark_dirty(row)
         updated_trade_ids.append(row["trade_id"])
-
-    if updated_trade_ids:
-        write_rows(journal_path, rows)
     return updated_trade_ids
 
 
@@ -385,9 +551,7 @@ def log_no_trade(
         "emotional_state": emotional_state,
         "notes": notes,
     }
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=NO_TRADE_FIELDNAMES)
-        writer.writerow(row)
+    open_store(journal_path, NO_TRADE_FIELDNAMES).append(row)
     return log_id
 
 
@@ -401,52 +565,60 @@ def add_pending_review(
     what_went_wrong: str,
     improvement_idea: str,
 ) -> None:
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=PENDING_REVIEW_FIELDNAMES)
-        writer.writerow(
-            {
-                "trade_id": trade_id,
-                "outcome": outcome,
-                "r_multiple": r_multiple,
-                "exit_reason": exit_reason,
-                "what_went_right": what_went_right,
-                "what_went_wrong": what_went_wrong,
-                "improvement_idea": improvement_idea,
-            }
-        )
-
-
-def apply_pending_reviews(journal_path: str, pending_path: str) -> int:
-    pending_rows = list(read_rows(pending_path))
+    open_store(journal_path, PENDING_REVIEW_FIELDNAMES).append(
+        {
+            "trade_id": trade_id,
+            "outcome": outcome,
+            "r_multiple": r_multiple,
+            "exit_reason": exit_reason,
+            "what_went_right": what_went_right,
+            "what_went_wrong": what_went_wrong,
+            "improvement_idea": improvement_idea,
+        }
+    )
+
+
+@dataclass(frozen=True)
+class PendingReviewResult:
+    applied: int
+    deferred: int
+    duplicated: int
+
+
+def apply_pending_reviews(
+    journal_path: str | JournalStore, pending_path: str
+) -> PendingReviewResult:
+    pending_store = open_store(pending_path, PENDING_REVIEW_FIELDNAMES)
+    pending_rows = list(pending_store.read_rows())
     if not pending_rows:
-        return 0
-    rows = list(read_rows(journal_path))
-    pending_by_id = {row["trade_id"]: row for row in pending_rows}
+        return PendingReviewResult(applied=0, deferred=0, duplicated=0)
     applied = 0
+    duplicated = 0
     remaining = []
-    for pending in pending_rows:
-        trade_id = pending["trade_id"]
-        match = next((row for row in rows if row["trade_id"] == trade_id), None)
-        if not match or not match.get("exit_ts"):
-            remaining.append(pending)
-            continue
-        if match.get("outcome"):
+    with _journal_store(journal_path) as journal:
+        for pending in pending_rows:
+            match = journal.get(pending["trade_id"])
+            if not match or not match.get("exit_ts"):
+                remaining.append(pending)
+                continue
+            # A review for a trade that already has an outcome (logged
+            # earlier or by an earlier row in this batch) is dropped.
+            if match.get("outcome"):
+                duplicated += 1
+                continue
+            match["outcome"] = pending["outcome"]
+            match["r_multiple"] = pending["r_multiple"]
+            match["exit_reason"] = pending["exit_reason"]
+            match["what_went_right"] = pending["what_went_right"]
+            match["what_went_wrong"] = pending["what_went_wrong"]
+            match["improvement_idea"] = pending["improvement_idea"]
+            journal.mark_dirty(match)
             applied += 1
-            continue
-        match["outcome"] = pending["outcome"]
-        match["r_multiple"] = pending["r_multiple"]
-        match["exit_reason"] = pending["exit_reason"]
-        match["what_went_right"] = pending["what_went_right"]
-        match["what_went_wrong"] = pending["what_went_wrong"]
-        match["improvement_idea"] = pending["improvement_idea"]
-        applied += 1
-    if applied:
-        write_rows(journal_path, rows)
-    with open(pending_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=PENDING_REVIEW_FIELDNAMES)
-        writer.writeheader()
-        writer.writerows(remaining)
-    return applied
+    if len(remaining) != len(pending_rows):
+        pending_store.write_rows(remaining)
+    return PendingReviewResult(
+        applied=applied, deferred=len(remaining), duplicated=duplicated
+    )
 
 
 def enqueue_review(
@@ -456,23 +628,21 @@ def enqueue_review(
     exit_ts: str,
     exit_price: float,
 ) -> None:
-    existing = {row["trade_id"] for row in read_rows(journal_path)}
-    if trade_id in existing:
+    store = open_store(journal_path, REVIEW_QUEUE_FIELDNAMES)
+    if store.find(trade_id=trade_id):
         return
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=REVIEW_QUEUE_FIELDNAMES)
-        writer.writerow(
-            {
-                "trade_id": trade_id,
-                "symbol": symbol,
-                "exit_ts": exit_ts,
-                "exit_price": exit_price,
-            }
-        )
+    store.append(
+        {
+            "trade_id": trade_id,
+            "symbol": symbol,
+            "exit_ts": exit_ts,
+            "exit_price": exit_price,
+        }
+    )
 
 
 def list_review_queue(journal_path: str) -> list[dict]:
-    return list(read_rows(journal_path))
+    return list(open_store(journal_path, REVIEW_QUEUE_FIELDNAMES).read_rows())
 
 
 def enqueue_signal(
@@ -493,6 +663,8 @@ def enqueue_signal(
         "invalidation_reason": idea["invalidation_reason"],
         "stop_loss_logic": idea["stop_loss_logic"],
         "take_profit_logic": idea["take_profit_logic"],
+        "stop_price": idea.get("stop_price", ""),
+        "target_r": idea.get("target_r", ""),
         "market_context": idea["market_context"],
         "emotional_state": idea["emotional_state"],
         "order_type": order_type,
@@ -502,17 +674,15 @@ def enqueue_signal(
         "decision_ts": "",
         "decision_reason": "",
     }
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=SIGNAL_QUEUE_FIELDNAMES)
-        writer.writerow(row)
+    open_store(journal_path, SIGNAL_QUEUE_FIELDNAMES).append(row)
     return signal_id
 
 
 def list_signal_queue(journal_path: str, status: str | None = None) -> list[dict]:
-    rows = list(read_rows(journal_path))
+    store = open_store(journal_path, SIGNAL_QUEUE_FIELDNAMES)
     if status is None:
-        return rows
-    return [row for row in rows if row.get("status") == status]
+        return list(store.read_rows())
+    return store.find(status=status)
 
 
 def update_signal_status(
@@ -521,34 +691,34 @@ def update_signal_status(
     status: str,
     decision_reason: str = "",
 ) -> dict:
-    rows = list(read_rows(journal_path))
-    updated = None
-    for row in rows:
-        if row.get("signal_id") == signal_id:
-            row["status"] = status
-            row["decision_ts"] = datetime.now(timezone.utc).isoformat()
-            row["decision_reason"] = decision_reason
-            updated = row
-            break
+    updated = open_store(journal_path, SIGNAL_QUEUE_FIELDNAMES).update(
+        "signal_id",
+        signal_id,
+        {
+            "status": status,
+            "decision_ts": datetime.now(timezone.utc).isoformat(),
+            "decision_reason": decision_reason,
+        },
+    )
     if not updated:
         raise RuntimeError(f"Signal ID not found: {signal_id}")
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=SIGNAL_QUEUE_FIELDNAMES)
-        writer.writeheader()
-        writer.writerows(rows)
     return updated
 
 
 def list_execution_ledger(journal_path: str) -> list[dict]:
-    with open(journal_path, "r", newline="", encoding="utf-8") as file:
-        return list(csv.DictReader(file))
+    return list(open_store(journal_path, EXECUTION_LEDGER_FIELDNAMES).read_rows())
 
 
 def write_execution_ledger(journal_path: str, rows: list[dict]) -> None:
-    with open(journal_path, "w", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=EXECUTION_LEDGER_FIELDNAMES)
-        writer.writeheader()
-        writer.writerows(rows)
+    open_store(journal_path, EXECUTION_LEDGER_FIELDNAMES).write_rows(rows)
+
+
+def save_execution_ledger(
+    journal_path: str, rows: list[dict], changed: list[dict]
+) -> None:
+    open_store(journal_path, EXECUTION_LEDGER_FIELDNAMES).save_rows(
+        rows, changed, "event_id"
+    )
 
 
 def append_execution_event(
@@ -594,24 +764,23 @@ def append_execution_event(
         "take_profit_price": take_profit_price if take_profit_price is not None else "",
         "notes": notes,
     }
-    with open(journal_path, "a", newline="", encoding="utf-8") as file:
-        writer = csv.DictWriter(file, fieldnames=EXECUTION_LEDGER_FIELDNAMES)
-        writer.writerow(row)
+    open_store(journal_path, EXECUTION_LEDGER_FIELDNAMES).append(row)
     return event_id
 
 
-def find_open_trade_id(journal_path: str, symbol: str) -> str | None:
-    rows = list(read_rows(journal_path))
-    open_trades = [
-        row
-        for row in rows
-        if row.get("symbol") == symbol and not row.get("exit_ts")
-    ]
+def find_open_trade_id(journal_path: str | JournalStore, symbol: str) -> str | None:
+    if isinstance(journal_path, JournalStore):
+        open_trades = journal_path.open_rows(symbol)
+    else:
+        open_trades = open_store(journal_path, FIELDNAMES).find(
+            symbol=symbol, exit_ts=""
+        )
     if not open_trades:
         return None
     return open_trades[-1]["trade_id"]
 
 
-def count_open_trades(journal_path: str) -> int:
-    rows = list(read_rows(journal_path))
-    return sum(1 for row in rows if not row.get("exit_ts"))
+def count_open_trades(journal_path: str | JournalStore) -> int:
+    if isinstance(journal_path, JournalStore):
+        return len(journal_path.open_rows())
+    return len(open_store(journal_path, FIELDNAMES).find(exit_ts=""))
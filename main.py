@@ -1,23 +1,20 @@
+from __future__ import annotations
+
 import argparse
 import csv
+import importlib
 import json
 import os
 import re
+import sys
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from datetime import date as date_cls
+from typing import TYPE_CHECKING, Awaitable, Callable, TypeVar
 
-import pandas as pd
-
-from alpaca_client import AlpacaClient
-from backtest import (
-    BacktestResult,
-    run_backtest,
-    run_portfolio_backtest,
-    summarize_backtest,
-    run_recent_backtest,
-    write_backtest_rollup,
-)
 from config import AppConfig
 from journal import (
     init_journal,
@@ -43,15 +40,46 @@ from journal import (
     count_open_trades,
     append_execution_event,
     list_execution_ledger,
-    write_execution_ledger,
-)
-from trade_logic import find_trade_idea
-from review import (
-    daily_summary,
-    weekly_summary,
-    write_weekly_snapshot,
-    no_trade_summary,
+    extract_price_in_parentheses,
+    row_stop_price,
+    row_target_r,
+    STOP_PRICE_PATTERN,
+    save_execution_ledger,
+    STORE_FIELDNAMES,
+    JournalStore,
+    PendingReviewResult,
 )
+from order_cache import OrderCache, order_record
+from serve import forward, serve
+from storage import copy_store
+
+if TYPE_CHECKING:
+    from alpaca_client import AlpacaClient, AsyncAlpacaClient
+    from backtest import BacktestResult
+    from gate_cache import BacktestGateCache
+
+
+class _LazyModule:
+    # pandas, alpaca-py and the modules built on them are imported on first
+    # attribute access, so queue/ledger commands that only touch CSV or SQLite
+    # stores start without them.
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+asyncio = _LazyModule("asyncio")
+pd = _LazyModule("pandas")
+alpaca_client = _LazyModule("alpaca_client")
+backtest = _LazyModule("backtest")
+gate_cache = _LazyModule("gate_cache")
+review = _LazyModule("review")
+trade_logic = _LazyModule("trade_logic")
 
 
 def _regime_filter(config: AppConfig) -> dict:
@@ -76,26 +104,15 @@ def _read_universe(path: str) -> list[str]:
     return symbols
 
 
-def build_order_list(client: AlpacaClient, limit: int) -> list[dict]:
-    orders = client.list_recent_orders(limit=limit, status="closed")
-    order_list = []
-    for order in orders:
-        created_at = order.created_at
-        filled_at = order.filled_at
-        filled_avg_price = (
-            float(order.filled_avg_price) if order.filled_avg_price else None
-        )
-        order_list.append(
-            {
-                "order_id": str(order.id),
-                "symbol": order.symbol,
-                "side": order.side.value if hasattr(order.side, "value") else order.side,
-                "created_at": created_at,
-                "filled_at": filled_at,
-                "filled_avg_price": filled_avg_price,
-            }
+def build_order_list(
+    client: AlpacaClient, limit: int, config: AppConfig | None = None
+) -> list[dict]:
+    if config is not None and config.order_cache_path:
+        return OrderCache(config.order_cache_path).sync(
+            client, config.sleeve_id, limit
         )
-    return order_list
+    orders = client.list_recent_orders(limit=limit, status="closed")
+    return [order_record(order) for order in orders]
 
 
 def _order_status_value(status: object) -> str:
@@ -110,21 +127,29 @@ def _order_side_value(order_side: object) -> str:
     return str(order_side).lower()
 
 
-def _reconcile_execution_ledger(config: AppConfig, client: AlpacaClient) -> int:
+def _reconcile_execution_ledger(
+    config: AppConfig, client: AlpacaClient, sleeve_id: str | None = None
+) -> int:
     terminal = {"filled", "canceled", "expired", "rejected"}
     rows = list_execution_ledger(config.execution_ledger_path)
     if not rows:
         return 0
-    updated = 0
+    pending = [
+        row
+        for row in rows
+        if row.get("order_id", "")
+        and str(row.get("status", "")).lower() not in terminal
+        and (sleeve_id is None or row.get("sleeve_id") == sleeve_id)
+    ]
+    if not pending:
+        return 0
+    orders = client.get_orders_by_id([row["order_id"] for row in pending])
+    changed_rows = []
     now_iso = datetime.now(timezone.utc).isoformat()
-    for row in rows:
-        order_id = row.get("order_id", "")
+    for row in pending:
         status = str(row.get("status", "")).lower()
-        if not order_id or status in terminal:
-            continue
-        try:
-            order = client.get_order(order_id)
-        except Exception:
+        order = orders.get(row["order_id"])
+        if order is None:
             continue
         next_status = _order_status_value(getattr(order, "status", ""))
         filled_qty = getattr(order, "filled_qty", None)
@@ -152,10 +177,9 @@ def _reconcile_execution_ledger(config: AppConfig, client: AlpacaClient) -> int:
             changed = True
         if changed:
             row["updated_ts"] = now_iso
-            updated += 1
-    if updated:
-        write_execution_ledger(config.execution_ledger_path, rows)
-    return updated
+            changed_rows.append(row)
+    save_execution_ledger(config.execution_ledger_path, rows, changed_rows)
+    return len(changed_rows)
 
 
 def _allowed_setups_for_symbol(config: AppConfig, symbol: str) -> set[str] | None:
@@ -169,6 +193,36 @@ def _allowed_setups_for_symbol(config: AppConfig, symbol: str) -> set[str] | Non
     return enabled & symbol_setups
 
 
+_BACKTEST_GATE_CACHES: dict[str, BacktestGateCache] = {}
+_ALPACA_CLIENTS: dict[tuple, AlpacaClient] = {}
+
+
+def _alpaca_client(config: AppConfig) -> AlpacaClient:
+    # One client per account and bar cache, so a serve process keeps its HTTP
+    # sessions and in-memory bars across commands.
+    key = (
+        config.api_key,
+        config.api_secret,
+        config.paper,
+        config.bar_cache_dir,
+        config.daily_bar_ready_time,
+        config.alpaca_max_concurrency,
+        config.calendar_cache_path,
+    )
+    if key not in _ALPACA_CLIENTS:
+        _ALPACA_CLIENTS[key] = alpaca_client.AlpacaClient(config)
+    return _ALPACA_CLIENTS[key]
+
+
+def _backtest_gate_cache(config: AppConfig) -> BacktestGateCache | None:
+    path = config.backtest_gate_cache_path
+    if not path:
+        return None
+    if path not in _BACKTEST_GATE_CACHES:
+        _BACKTEST_GATE_CACHES[path] = gate_cache.BacktestGateCache(path)
+    return _BACKTEST_GATE_CACHES[path]
+
+
 def _passes_backtest_gate(
     client: AlpacaClient,
     config: AppConfig,
@@ -177,19 +231,37 @@ def _passes_backtest_gate(
 ) -> tuple[bool, str]:
     if config.backtest_gate_days <= 0:
         return True, ""
-    output_path = (
-        f"data/backtest_gate_{symbol}_{setup_name}_{config.backtest_gate_days}d.csv"
-    )
-    result = run_recent_backtest(
-        client=client,
-        symbol=symbol,
-        recent_days=config.backtest_gate_days,
-        risk_multiple=2.0,
-        time_stop_days=5,
-        output_path=output_path,
-        setup_name=setup_name,
-        regime_filter=_regime_filter(config),
-    )
+    regime_filter = _regime_filter(config)
+    # The gate window ends at today's UTC date, so results only change once
+    # that date (and with it the newest bar in range) moves.
+    as_of = pd.Timestamp.now(tz="UTC").date().isoformat()
+    cache = _backtest_gate_cache(config)
+    cache_key = gate_cache.gate_cache_key(
+        symbol,
+        setup_name,
+        config.backtest_gate_days,
+        2.0,
+        5,
+        regime_filter,
+        as_of,
+    )
+    result = cache.get(cache_key) if cache else None
+    if result is None:
+        output_path = (
+            f"data/backtest_gate_{symbol}_{setup_name}_{config.backtest_gate_days}d.csv"
+        )
+        result = backtest.run_recent_backtest(
+            client=client,
+            symbol=symbol,
+            recent_days=config.backtest_gate_days,
+            risk_multiple=2.0,
+            time_stop_days=5,
+            output_path=output_path,
+            setup_name=setup_name,
+            regime_filter=regime_filter,
+        )
+        if cache:
+            cache.store(cache_key, as_of, result)
     if result.total_trades < config.backtest_gate_min_trades:
         return (
             False,
@@ -214,8 +286,87 @@ def _passes_backtest_gate(
     return True, ""
 
 
-def _latest_close_price(client: AlpacaClient, symbol: str) -> float:
-    bars = client.get_recent_daily_bars(symbol, days=5)
+_K = TypeVar("_K")
+
+
+def _gather_alpaca(
+    client: AlpacaClient,
+    keys: list[_K],
+    fetch: Callable[[AsyncAlpacaClient, _K], Awaitable[object]],
+) -> dict[_K, object]:
+    # Runs fetch for every key concurrently on a bounded AsyncAlpacaClient;
+    # a key whose fetch raised maps to the exception.
+    async def _gather() -> dict[_K, object]:
+        async with alpaca_client.AsyncAlpacaClient(client) as async_client:
+            results = await asyncio.gather(
+                *(fetch(async_client, key) for key in keys), return_exceptions=True
+            )
+        return dict(zip(keys, results))
+
+    if not keys:
+        return {}
+    return asyncio.run(_gather())
+
+
+def _recent_daily_bars_many(
+    client: AlpacaClient, symbols: list[str], days: int = 10
+) -> dict[str, pd.DataFrame]:
+    if len(symbols) <= alpaca_client.BARS_BATCH_SIZE:
+        return client.get_recent_daily_bars_many(symbols, days=days)
+
+    async def _fetch() -> dict[str, pd.DataFrame]:
+        async with alpaca_client.AsyncAlpacaClient(client) as async_client:
+            return await async_client.get_recent_daily_bars_many(symbols, days=days)
+
+    return asyncio.run(_fetch())
+
+
+OPEN_ORDERS_LIMIT = 200
+
+
+class MarketSnapshot:
+    # Broker state shared by the guards and exit checks of one command:
+    # recent daily bars per symbol, open positions and open orders. Each part
+    # is fetched on first use and then reused, so a command reads it once.
+    def __init__(self, client: AlpacaClient) -> None:
+        self.client = client
+        self._bars: dict[str, pd.DataFrame | None] = {}
+        self._positions: list | None = None
+        self._open_orders: list | None = None
+
+    def prefetch_bars(self, symbols: list[str]) -> None:
+        missing = [
+            symbol
+            for symbol in dict.fromkeys(value.upper() for value in symbols)
+            if symbol not in self._bars
+        ]
+        if not missing:
+            return
+        bars_by_symbol = _recent_daily_bars_many(self.client, missing)
+        for symbol in missing:
+            self._bars[symbol] = bars_by_symbol.get(symbol)
+
+    def bars(self, symbol: str) -> pd.DataFrame | None:
+        self.prefetch_bars([symbol])
+        return self._bars[symbol.upper()]
+
+    def latest_close(self, symbol: str) -> float:
+        return _latest_close_from_bars(symbol, self.bars(symbol))
+
+    def positions(self) -> list:
+        if self._positions is None:
+            self._positions = list(self.client.list_open_positions())
+        return self._positions
+
+    def open_orders(self) -> list:
+        if self._open_orders is None:
+            self._open_orders = list(
+                self.client.list_recent_orders(limit=OPEN_ORDERS_LIMIT, status="open")
+            )
+        return self._open_orders
+
+
+def _latest_close_from_bars(symbol: str, bars: pd.DataFrame | None) -> float:
     if bars is None or bars.empty:
         raise RuntimeError(f"No recent bars available for {symbol}")
     df = bars.reset_index()
@@ -223,9 +374,9 @@ def _latest_close_price(client: AlpacaClient, symbol: str) -> float:
     return float(df.iloc[-1]["close"])
 
 
-def _open_exposure_usd(client: AlpacaClient) -> float:
+def _open_exposure_usd(snapshot: MarketSnapshot) -> float:
     total = 0.0
-    for position in client.list_open_positions():
+    for position in snapshot.positions():
         market_value = getattr(position, "market_value", None)
         if market_value not in (None, ""):
             total += abs(float(market_value))
@@ -237,7 +388,7 @@ def _open_exposure_usd(client: AlpacaClient) -> float:
 
 
 def _capital_guard(
-    client: AlpacaClient,
+    snapshot: MarketSnapshot,
     config: AppConfig,
     symbol: str,
     qty: float,
@@ -251,10 +402,10 @@ def _capital_guard(
     order_price = (
         float(limit_price)
         if order_type == "limit" and limit_price is not None
-        else _latest_close_price(client, symbol)
+        else snapshot.latest_close(symbol)
     )
     order_notional = abs(qty * order_price)
-    open_exposure = _open_exposure_usd(client)
+    open_exposure = _open_exposure_usd(snapshot)
     projected = open_exposure + order_notional
     if projected > config.max_capital_usd:
         return (
@@ -272,36 +423,9 @@ def _capital_guard(
     )
 
 
-def _extract_stop_price(stop_loss_logic: str) -> float | None:
-    if not stop_loss_logic:
-        return None
-    match = re.search(r"\(([-+]?[0-9]*\.?[0-9]+)\)", stop_loss_logic)
-    if not match:
-        return None
-    return float(match.group(1))
-
-
-def _extract_r_multiple(take_profit_logic: str) -> float | None:
-    if not take_profit_logic:
-        return None
-    match = re.search(r"([-+]?[0-9]*\.?[0-9]+)\s*R", take_profit_logic, re.IGNORECASE)
-    if not match:
-        return None
-    return float(match.group(1))
-
-
-def _extract_price_in_parentheses(value: str) -> float | None:
-    if not value:
-        return None
-    match = re.search(r"\(([-+]?[0-9]*\.?[0-9]+)\)", value)
-    if not match:
-        return None
-    return float(match.group(1))
-
-
-def _open_position_map(client: AlpacaClient) -> dict[str, dict]:
+def _open_position_map(snapshot: MarketSnapshot) -> dict[str, dict]:
     positions = {}
-    for position in client.list_open_positions():
+    for position in snapshot.positions():
         symbol = getattr(position, "symbol", "").upper()
         if not symbol:
             continue
@@ -314,10 +438,10 @@ def _open_position_map(client: AlpacaClient) -> dict[str, dict]:
     return positions
 
 
-def _pending_close_symbols(client: AlpacaClient, limit: int = 200) -> set[str]:
+def _pending_close_symbols(snapshot: MarketSnapshot) -> set[str]:
     symbols: set[str] = set()
     try:
-        orders = client.list_recent_orders(limit=limit, status="open")
+        orders = snapshot.open_orders()
     except Exception:
         # Fail-safe: if we cannot read open orders, keep strict slot behavior.
         return symbols
@@ -332,13 +456,13 @@ def _pending_close_symbols(client: AlpacaClient, limit: int = 200) -> set[str]:
 
 
 def _effective_open_trade_count_for_queue(
-    client: AlpacaClient, journal_path: str
+    snapshot: MarketSnapshot, journal_path: str | JournalStore
 ) -> tuple[int, int, set[str]]:
     open_rows = [row for row in read_rows(journal_path) if not row.get("exit_ts")]
     raw_open = len(open_rows)
     if raw_open == 0:
         return 0, 0, set()
-    pending_closes = _pending_close_symbols(client)
+    pending_closes = _pending_close_symbols(snapshot)
     if not pending_closes:
         return raw_open, raw_open, set()
     effective_open = sum(
@@ -347,15 +471,17 @@ def _effective_open_trade_count_for_queue(
     return effective_open, raw_open, pending_closes
 
 
-def _open_risk_to_stops_usd(client: AlpacaClient, journal_path: str) -> float:
+def _open_risk_to_stops_usd(
+    snapshot: MarketSnapshot, journal_path: str | JournalStore
+) -> float:
     rows = list(read_rows(journal_path))
     open_rows = [row for row in rows if not row.get("exit_ts")]
-    positions = _open_position_map(client)
+    positions = _open_position_map(snapshot)
     total_risk = 0.0
     for row in open_rows:
         symbol = row.get("symbol", "").upper()
         direction = row.get("direction", "long")
-        stop_price = _extract_stop_price(row.get("stop_loss_logic", ""))
+        stop_price = row_stop_price(row)
         position = positions.get(symbol)
         if not position or stop_price is None:
             continue
@@ -369,137 +495,174 @@ def _open_risk_to_stops_usd(client: AlpacaClient, journal_path: str) -> float:
     return total_risk
 
 
-def _count_trading_sessions(
-    client: AlpacaClient, start_date: date_cls, end_date: date_cls
-) -> int:
-    if end_date < start_date:
-        return 0
+def _count_trading_sessions_many(
+    client: AlpacaClient, start_dates: list[date_cls], end_date: date_cls
+) -> dict[date_cls, int]:
+    starts = [
+        start_date
+        for start_date in dict.fromkeys(start_dates)
+        if start_date <= end_date
+    ]
+    counts = _gather_alpaca(
+        client,
+        starts,
+        lambda async_client, start_date: async_client.count_trading_sessions(
+            start_date, end_date
+        ),
+    )
+    sessions: dict[date_cls, int] = {}
+    for start_date in start_dates:
+        count = counts.get(start_date)
+        sessions[start_date] = count if isinstance(count, int) else 0
+    return sessions
+
+
+OPEN_TRADE_COLUMNS = [
+    "trade_id",
+    "symbol",
+    "setup_name",
+    "entry_ts",
+    "entry_price",
+    "stop_loss_logic",
+    "stop_price",
+    "direction",
+]
+
+
+def _entry_date(entry_ts: str) -> date_cls | None:
     try:
-        calendar = client.get_calendar(
-            start_date.isoformat(),
-            end_date.isoformat(),
+        return datetime.fromisoformat(entry_ts).date() if entry_ts else None
+    except ValueError:
+        return None
+
+
+def _open_trade_frame(
+    snapshot: MarketSnapshot,
+    journal_path: str | JournalStore,
+    as_of_date: date_cls | None = None,
+) -> pd.DataFrame:
+    # One row per open trade with a parsed stop and entry, the last two closes
+    # from one batched bar fetch, and current R; sessions_elapsed is filled
+    # in when as_of_date is given. Both exit checks filter this frame.
+    trades = pd.DataFrame(
+        [row for row in read_rows(journal_path) if not row.get("exit_ts")],
+        columns=OPEN_TRADE_COLUMNS,
+    ).fillna("")
+    trades["symbol"] = trades["symbol"].str.upper()
+    trades["direction"] = trades["direction"].replace("", "long").str.lower()
+    trades["stop_price"] = trades["stop_price"].map(_to_float).astype(float)
+    unparsed = trades["stop_price"].isna()
+    if unparsed.any():
+        # Rows from before the stop_price column fall back to the text.
+        trades.loc[unparsed, "stop_price"] = (
+            trades.loc[unparsed, "stop_loss_logic"]
+            .str.extract(STOP_PRICE_PATTERN, expand=False)
+            .map(_to_float)
+            .astype(float)
         )
-    except Exception:
-        return 0
-    return len(calendar)
+    trades["entry_price"] = (
+        trades["entry_price"].replace("", "0").map(_to_float).astype(float)
+    )
+    trades["risk"] = (trades["entry_price"] - trades["stop_price"]).abs()
+    trades = trades[(trades["symbol"] != "") & (trades["risk"] > 0)].copy()
+
+    symbols = trades["symbol"].unique().tolist()
+    snapshot.prefetch_bars(symbols)
+    closes: dict[str, pd.Series] = {}
+    for symbol in symbols:
+        bars = snapshot.bars(symbol)
+        if bars is not None and not bars.empty:
+            closes[symbol] = bars["close"]
+    if closes:
+        last_two = (
+            pd.concat(closes, names=["symbol", "timestamp"])
+            .sort_index()
+            .groupby(level="symbol")
+            .tail(2)
+            .groupby(level="symbol")
+        )
+        latest = pd.DataFrame(
+            {
+                "current_price": last_two.last(),
+                "prev_close": last_two.first().where(last_two.size() >= 2),
+            }
+        )
+    else:
+        latest = pd.DataFrame(columns=["current_price", "prev_close"], dtype=float)
+    trades = trades.join(latest, on="symbol")
+
+    short = trades["direction"] == "short"
+    trades["r_multiple"] = (
+        short.map({True: -1.0, False: 1.0})
+        * (trades["current_price"] - trades["entry_price"])
+        / trades["risk"]
+    )
+    trades["momentum_weak"] = (
+        short & (trades["current_price"] > trades["prev_close"])
+    ) | (~short & (trades["current_price"] < trades["prev_close"]))
+
+    trades["sessions_elapsed"] = float("nan")
+    if as_of_date is not None:
+        entry_dates = trades["entry_ts"].map(_entry_date)
+        sessions = _count_trading_sessions_many(
+            snapshot.client, [value for value in entry_dates if value], as_of_date
+        )
+        trades["sessions_elapsed"] = entry_dates.map(
+            lambda value: max(0, sessions[value] - 1) if value else float("nan")
+        ).astype(float)
+    return trades
 
 
 def _time_stop_due_trades(
-    client: AlpacaClient,
-    journal_path: str,
-    as_of_date: date_cls,
-    time_stop_days: int,
-    time_stop_min_r: float,
+    trades: pd.DataFrame, time_stop_days: int, time_stop_min_r: float
 ) -> list[dict]:
     if time_stop_days <= 0:
         return []
-    rows = list(read_rows(journal_path))
-    open_rows = [row for row in rows if not row.get("exit_ts")]
-    due: list[dict] = []
-    for row in open_rows:
-        symbol = row.get("symbol", "").upper()
-        if not symbol:
-            continue
-        entry_ts = row.get("entry_ts")
-        if not entry_ts:
-            continue
-        try:
-            entry_dt = datetime.fromisoformat(entry_ts)
-        except ValueError:
-            continue
-        entry_date = entry_dt.date()
-        sessions = _count_trading_sessions(client, entry_date, as_of_date)
-        sessions_elapsed = max(0, sessions - 1)
-        if sessions_elapsed < time_stop_days:
-            continue
-        stop_price = _extract_stop_price(row.get("stop_loss_logic", ""))
-        if stop_price is None:
-            continue
-        try:
-            entry_price = float(row.get("entry_price") or 0)
-        except (TypeError, ValueError):
-            continue
-        risk = abs(entry_price - stop_price)
-        if risk <= 0:
-            continue
-        try:
-            current_price = _latest_close_price(client, symbol)
-        except Exception:
-            continue
-        direction = (row.get("direction") or "long").lower()
-        if direction == "short":
-            r_multiple = (entry_price - current_price) / risk
-        else:
-            r_multiple = (current_price - entry_price) / risk
-        if r_multiple >= time_stop_min_r:
-            continue
-        due.append(
-            {
-                "trade_id": row.get("trade_id", ""),
-                "symbol": symbol,
-                "setup_name": row.get("setup_name", ""),
-                "entry_ts": entry_ts,
-                "entry_price": entry_price,
-                "current_price": current_price,
-                "sessions_elapsed": sessions_elapsed,
-                "r_multiple": r_multiple,
-            }
-        )
-    return due
+    due = trades[
+        (trades["sessions_elapsed"] >= time_stop_days)
+        & trades["current_price"].notna()
+        & (trades["r_multiple"] < time_stop_min_r)
+    ]
+    return [
+        {
+            "trade_id": row.trade_id,
+            "symbol": row.symbol,
+            "setup_name": row.setup_name,
+            "entry_ts": row.entry_ts,
+            "entry_price": float(row.entry_price),
+            "current_price": float(row.current_price),
+            "sessions_elapsed": int(row.sessions_elapsed),
+            "r_multiple": float(row.r_multiple),
+            "direction": row.direction,
+            "stop_loss_logic": row.stop_loss_logic,
+            "stop_price": float(row.stop_price),
+        }
+        for row in due.itertuples(index=False)
+    ]
 
 
 def _momentum_exit_due_trades(
-    client: AlpacaClient,
-    journal_path: str,
-    min_r_multiple: float = 1.0,
+    trades: pd.DataFrame, min_r_multiple: float = 1.0
 ) -> list[dict]:
-    rows = list(read_rows(journal_path))
-    open_rows = [row for row in rows if not row.get("exit_ts")]
-    due: list[dict] = []
-    for row in open_rows:
-        symbol = row.get("symbol", "").upper()
-        if not symbol:
-            continue
-        stop_price = _extract_stop_price(row.get("stop_loss_logic", ""))
-        if stop_price is None:
-            continue
-        try:
-            entry_price = float(row.get("entry_price") or 0)
-        except (TypeError, ValueError):
-            continue
-        risk = abs(entry_price - stop_price)
-        if risk <= 0:
-            continue
-        bars = client.get_recent_daily_bars(symbol, days=8)
-        if bars is None or bars.empty:
-            continue
-        bars = bars.reset_index().sort_values("timestamp")
-        if len(bars) < 2:
-            continue
-        current_close = float(bars.iloc[-1]["close"])
-        prev_close = float(bars.iloc[-2]["close"])
-        direction = (row.get("direction") or "long").lower()
-        if direction == "short":
-            current_r = (entry_price - current_close) / risk
-            momentum_weak = current_close > prev_close
-        else:
-            current_r = (current_close - entry_price) / risk
-            momentum_weak = current_close < prev_close
-        if current_r < min_r_multiple or not momentum_weak:
-            continue
-        due.append(
-            {
-                "trade_id": row.get("trade_id", ""),
-                "symbol": symbol,
-                "setup_name": row.get("setup_name", ""),
-                "entry_price": entry_price,
-                "current_price": current_close,
-                "r_multiple": current_r,
-                "direction": direction,
-                "stop_loss_logic": row.get("stop_loss_logic", ""),
-            }
-        )
-    return due
+    due = trades[
+        trades["prev_close"].notna()
+        & (trades["r_multiple"] >= min_r_multiple)
+        & trades["momentum_weak"]
+    ]
+    return [
+        {
+            "trade_id": row.trade_id,
+            "symbol": row.symbol,
+            "setup_name": row.setup_name,
+            "entry_price": float(row.entry_price),
+            "current_price": float(row.current_price),
+            "r_multiple": float(row.r_multiple),
+            "direction": row.direction,
+            "stop_loss_logic": row.stop_loss_logic,
+            "stop_price": float(row.stop_price),
+        }
+        for row in due.itertuples(index=False)
+    ]
 
 
 def _safe_recent_backtest_score(
@@ -515,7 +678,7 @@ def _safe_recent_backtest_score(
         f"/tmp/signal_score_{symbol}_{setup_name}_{int(time.time() * 1_000_000)}.csv"
     )
     try:
-        result = run_recent_backtest(
+        result = backtest.run_recent_backtest(
             client=client,
             symbol=symbol,
             recent_days=lookback_days,
@@ -630,36 +793,36 @@ def _load_last_fetch_status(local_root: str) -> dict | None:
 
 
 def _estimate_entry_price(
-    client: AlpacaClient,
+    snapshot: MarketSnapshot,
     symbol: str,
     order_type: str,
     limit_price: float | None,
 ) -> float:
     if order_type == "limit" and limit_price is not None:
         return float(limit_price)
-    return _latest_close_price(client, symbol)
+    return snapshot.latest_close(symbol)
 
 
 def _derive_bracket_prices(
-    client: AlpacaClient,
+    snapshot: MarketSnapshot,
     symbol: str,
     direction: str,
     order_type: str,
     limit_price: float | None,
-    stop_loss_logic: str,
+    stop_price: float | None,
+    target_r: float | None,
     take_profit_logic: str,
 ) -> tuple[float | None, float | None, str]:
-    stop_price = _extract_stop_price(stop_loss_logic)
     if stop_price is None:
         return None, None, "could not parse stop price from stop_loss_logic"
 
-    target_price = _extract_price_in_parentheses(take_profit_logic)
-    if target_price is None:
-        r_multiple = _extract_r_multiple(take_profit_logic)
-        if r_multiple is None:
+    if target_r is None:
+        target_price = extract_price_in_parentheses(take_profit_logic)
+        if target_price is None:
             return None, None, "could not parse take profit from take_profit_logic"
+    else:
         entry_price = _estimate_entry_price(
-            client=client,
+            snapshot=snapshot,
             symbol=symbol,
             order_type=order_type,
             limit_price=limit_price,
@@ -668,9 +831,9 @@ def _derive_bracket_prices(
         if risk <= 0:
             return None, None, "invalid risk distance between entry and stop"
         if direction == "long":
-            target_price = entry_price + (r_multiple * risk)
+            target_price = entry_price + (target_r * risk)
         else:
-            target_price = entry_price - (r_multiple * risk)
+            target_price = entry_price - (target_r * risk)
 
     if direction == "long":
         if stop_price >= target_price:
@@ -682,29 +845,29 @@ def _derive_bracket_prices(
 
 
 def _risk_guard(
-    client: AlpacaClient,
+    snapshot: MarketSnapshot,
     config: AppConfig,
     symbol: str,
     direction: str,
-    stop_loss_logic: str,
+    stop_price: float | None,
     qty: float,
     order_type: str,
     limit_price: float | None,
+    journal: JournalStore | None = None,
 ) -> tuple[bool, str]:
     if config.max_total_open_risk_usd <= 0:
         return True, ""
     if qty <= 0:
         return False, f"qty must be > 0, got {qty}"
-    stop_price = _extract_stop_price(stop_loss_logic)
     if stop_price is None:
         return False, "could not parse stop price from stop_loss_logic"
-    entry_price = _estimate_entry_price(client, symbol, order_type, limit_price)
+    entry_price = _estimate_entry_price(snapshot, symbol, order_type, limit_price)
     if direction == "long":
         risk_per_unit = max(0.0, entry_price - stop_price)
     else:
         risk_per_unit = max(0.0, stop_price - entry_price)
     new_order_risk = risk_per_unit * abs(qty)
-    open_risk = _open_risk_to_stops_usd(client, config.journal_path)
+    open_risk = _open_risk_to_stops_usd(snapshot, journal or config.journal_path)
     projected_risk = open_risk + new_order_risk
     if projected_risk > config.max_total_open_risk_usd:
         return (
@@ -744,7 +907,8 @@ def evaluate_and_trade(
         )
         print(f"Watch-only symbol. Logged no-trade: log_id={log_id}")
         return None
-    if count_open_trades(config.journal_path) >= config.max_open_positions:
+    journal = JournalStore(config.journal_path)
+    if count_open_trades(journal) >= config.max_open_positions:
         log_id = log_no_trade(
             config.no_trade_journal_path,
             symbol=symbol,
@@ -755,12 +919,14 @@ def evaluate_and_trade(
         )
         print(f"Max open positions reached. Logged no-trade: log_id={log_id}")
         return None
+    snapshot = MarketSnapshot(client)
     allowed_setups = _allowed_setups_for_symbol(config, symbol)
-    idea = find_trade_idea(
+    idea = trade_logic.find_trade_idea(
         client,
         symbol,
         allowed_setups,
         regime_filter=_regime_filter(config),
+        bars=snapshot.bars(symbol),
     )
     if idea is None:
         log_id = log_no_trade(
@@ -792,7 +958,7 @@ def evaluate_and_trade(
         return None
 
     cap_allowed, cap_message = _capital_guard(
-        client=client,
+        snapshot=snapshot,
         config=config,
         symbol=idea["symbol"],
         qty=float(config.fixed_position_size),
@@ -811,14 +977,15 @@ def evaluate_and_trade(
         print(f"Capital cap exceeded. Logged no-trade: log_id={log_id}")
         return None
     risk_allowed, risk_message = _risk_guard(
-        client=client,
+        snapshot=snapshot,
         config=config,
         symbol=idea["symbol"],
         direction=idea["direction"],
-        stop_loss_logic=idea["stop_loss_logic"],
+        stop_price=row_stop_price(idea),
         qty=float(config.fixed_position_size),
         order_type=order_type,
         limit_price=limit_price,
+        journal=journal,
     )
     if not risk_allowed:
         log_id = log_no_trade(
@@ -832,12 +999,13 @@ def evaluate_and_trade(
         print(f"Risk cap exceeded. Logged no-trade: log_id={log_id}")
         return None
     stop_price, take_profit_price, bracket_error = _derive_bracket_prices(
-        client=client,
+        snapshot=snapshot,
         symbol=idea["symbol"],
         direction=idea["direction"],
         order_type=order_type,
         limit_price=limit_price,
-        stop_loss_logic=idea["stop_loss_logic"],
+        stop_price=row_stop_price(idea),
+        target_r=row_target_r(idea),
         take_profit_logic=idea["take_profit_logic"],
     )
     if bracket_error:
@@ -868,7 +1036,7 @@ def evaluate_and_trade(
         order=order,
     )
     entry_price_est = _estimate_entry_price(
-        client=client,
+        snapshot=snapshot,
         symbol=idea["symbol"],
         order_type=order_type,
         limit_price=limit_price,
@@ -917,7 +1085,7 @@ def evaluate_and_queue(
         print(f"Watch-only symbol. Logged no-trade: log_id={log_id}")
         return None
     effective_open, raw_open, pending_closes = _effective_open_trade_count_for_queue(
-        client, config.journal_path
+        MarketSnapshot(client), config.journal_path
     )
     if effective_open >= config.max_open_positions:
         log_id = log_no_trade(
@@ -943,7 +1111,7 @@ def evaluate_and_queue(
             f" pending_close_symbols={','.join(sorted(pending_closes))}"
         )
     allowed_setups = _allowed_setups_for_symbol(config, symbol)
-    idea = find_trade_idea(
+    idea = trade_logic.find_trade_idea(
         client,
         symbol,
         allowed_setups,
@@ -1005,7 +1173,7 @@ def evaluate_and_queue(
 
 
 def handle_trade(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     evaluate_and_trade(
         client,
         config,
@@ -1020,7 +1188,7 @@ def handle_trade(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_signal(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     evaluate_and_queue(
         client,
         config,
@@ -1053,11 +1221,11 @@ def handle_log_exit(config: AppConfig, args: argparse.Namespace) -> None:
 
 def handle_review(config: AppConfig, args: argparse.Namespace) -> None:
     if args.window == "daily":
-        summary = daily_summary(
+        summary = review.daily_summary(
             config.journal_path, config.no_trade_journal_path, args.date
         )
     else:
-        summary = weekly_summary(
+        summary = review.weekly_summary(
             config.journal_path, config.no_trade_journal_path, args.date
         )
     for key, value in summary.items():
@@ -1065,7 +1233,7 @@ def handle_review(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_daily_report(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     if args.date:
         if "T" in args.date:
             target_date = datetime.fromisoformat(args.date).date()
@@ -1076,10 +1244,10 @@ def handle_daily_report(config: AppConfig, args: argparse.Namespace) -> None:
     start = datetime.combine(target_date, datetime.min.time(), tzinfo=timezone.utc)
     end = start + timedelta(days=1)
 
-    summary = daily_summary(
+    summary = review.daily_summary(
         config.journal_path, config.no_trade_journal_path, target_date.isoformat()
     )
-    no_trades = no_trade_summary(
+    no_trades = review.no_trade_summary(
         config.no_trade_journal_path, target_date.isoformat(), days=1
     )
     signals = list_signal_queue(config.signal_queue_path, status=None)
@@ -1100,18 +1268,15 @@ def handle_daily_report(config: AppConfig, args: argparse.Namespace) -> None:
         status = row.get("status") or "unknown"
         status_counts[status] = status_counts.get(status, 0) + 1
 
+    trades = _open_trade_frame(
+        MarketSnapshot(client), config.journal_path, as_of_date=target_date
+    )
     time_stop_due = _time_stop_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        as_of_date=target_date,
+        trades,
         time_stop_days=config.time_stop_days,
         time_stop_min_r=config.time_stop_min_r,
     )
-    momentum_due = _momentum_exit_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        min_r_multiple=1.0,
-    )
+    momentum_due = _momentum_exit_due_trades(trades, min_r_multiple=1.0)
 
     lines = []
     lines.append(f"Daily report ({target_date.isoformat()})")
@@ -1218,43 +1383,77 @@ def handle_daily_report(config: AppConfig, args: argparse.Namespace) -> None:
     print(f"wrote_daily_report: {output_path}")
 
 
+def _enqueue_exit_reviews(
+    config: AppConfig,
+    journal: JournalStore,
+    updated_trade_ids: list[str],
+    announce: bool = False,
+) -> None:
+    if not updated_trade_ids:
+        return
+    queued = {row["trade_id"] for row in list_review_queue(config.review_queue_path)}
+    for trade_id in updated_trade_ids:
+        if trade_id in queued:
+            continue
+        row = journal.get(trade_id)
+        if not row or row.get("outcome"):
+            continue
+        enqueue_review(
+            config.review_queue_path,
+            trade_id=trade_id,
+            symbol=row["symbol"],
+            exit_ts=row["exit_ts"],
+            exit_price=row["exit_price"],
+        )
+        queued.add(trade_id)
+        if announce:
+            print(f"Review needed: trade_id={trade_id}")
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    entry_prices: int
+    exit_trade_ids: list[str]
+    reviews: PendingReviewResult
+    ledger_updates: int
+
+
+def sync_journal(
+    config: AppConfig, client: AlpacaClient, args: argparse.Namespace
+) -> SyncResult:
+    order_list = build_order_list(client, args.limit, config)
+    ledger_updates = _reconcile_execution_ledger(
+        config, client, config.sleeve_id if args.ledger_sleeve_only else None
+    )
+    journal = JournalStore(config.journal_path)
+    updated_entries = sync_entry_prices(journal, order_list)
+    updated_trade_ids = sync_exits(journal, order_list)
+    reviews = apply_pending_reviews(journal, config.pending_reviews_path)
+    journal.flush()
+    _enqueue_exit_reviews(config, journal, updated_trade_ids)
+    return SyncResult(
+        entry_prices=updated_entries,
+        exit_trade_ids=updated_trade_ids,
+        reviews=reviews,
+        ledger_updates=ledger_updates,
+    )
+
+
 def handle_sync(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
-    order_list = build_order_list(client, args.limit)
-    ledger_updates = _reconcile_execution_ledger(config, client)
-    updated_entries = sync_entry_prices(config.journal_path, order_list)
-    updated_trade_ids = sync_exits(config.journal_path, order_list)
-    applied_reviews = apply_pending_reviews(
-        config.journal_path, config.pending_reviews_path
-    )
-    if updated_trade_ids:
-        rows = list_review_queue(config.review_queue_path)
-        queued = {row["trade_id"] for row in rows}
-        journal_rows = list(read_rows(config.journal_path))
-        row_by_id = {row["trade_id"]: row for row in journal_rows}
-        for trade_id in updated_trade_ids:
-            if trade_id in queued:
-                continue
-            row = row_by_id.get(trade_id)
-            if not row or row.get("outcome"):
-                continue
-            enqueue_review(
-                config.review_queue_path,
-                trade_id=trade_id,
-                symbol=row["symbol"],
-                exit_ts=row["exit_ts"],
-                exit_price=row["exit_price"],
-            )
+    result = sync_journal(config, _alpaca_client(config), args)
     print(
         "Synced journal:"
-        f" entry_prices={updated_entries} exit_fields={len(updated_trade_ids)}"
-        f" applied_reviews={applied_reviews}"
-        f" ledger_updates={ledger_updates}"
+        f" entry_prices={result.entry_prices}"
+        f" exit_fields={len(result.exit_trade_ids)}"
+        f" applied_reviews={result.reviews.applied}"
+        f" deferred_reviews={result.reviews.deferred}"
+        f" duplicate_reviews={result.reviews.duplicated}"
+        f" ledger_updates={result.ledger_updates}"
     )
 
 
 def handle_run_daily(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     buffer_minutes = args.buffer_minutes
     symbols = [
         value.strip()
@@ -1262,36 +1461,20 @@ def handle_run_daily(config: AppConfig, args: argparse.Namespace) -> None:
         if value.strip()
     ]
     while True:
-        order_list = build_order_list(client, args.sync_limit)
-        updated_entries = sync_entry_prices(config.journal_path, order_list)
-        updated_trade_ids = sync_exits(config.journal_path, order_list)
-        applied_reviews = apply_pending_reviews(
-            config.journal_path, config.pending_reviews_path
-        )
-        if updated_trade_ids:
-            rows = list_review_queue(config.review_queue_path)
-            queued = {row["trade_id"] for row in rows}
-            journal_rows = list(read_rows(config.journal_path))
-            row_by_id = {row["trade_id"]: row for row in journal_rows}
-            for trade_id in updated_trade_ids:
-                if trade_id in queued:
-                    continue
-                row = row_by_id.get(trade_id)
-                if not row or row.get("outcome"):
-                    continue
-                enqueue_review(
-                    config.review_queue_path,
-                    trade_id=trade_id,
-                    symbol=row["symbol"],
-                    exit_ts=row["exit_ts"],
-                    exit_price=row["exit_price"],
-                )
-                print(f"Review needed: trade_id={trade_id}")
-        if updated_entries or updated_trade_ids or applied_reviews:
+        order_list = build_order_list(client, args.sync_limit, config)
+        journal = JournalStore(config.journal_path)
+        updated_entries = sync_entry_prices(journal, order_list)
+        updated_trade_ids = sync_exits(journal, order_list)
+        reviews = apply_pending_reviews(journal, config.pending_reviews_path)
+        journal.flush()
+        _enqueue_exit_reviews(config, journal, updated_trade_ids, announce=True)
+        if updated_entries or updated_trade_ids or reviews.applied:
             print(
                 "Synced journal:"
                 f" entry_prices={updated_entries} exit_fields={len(updated_trade_ids)}"
-                f" applied_reviews={applied_reviews}"
+                f" applied_reviews={reviews.applied}"
+                f" deferred_reviews={reviews.deferred}"
+                f" duplicate_reviews={reviews.duplicated}"
             )
         clock = client.get_clock()
         next_close = clock.next_close
@@ -1369,7 +1552,7 @@ def handle_run_daily(config: AppConfig, args: argparse.Namespace) -> None:
         if args.weekly_snapshot:
             now = datetime.now(timezone.utc)
             if now.weekday() == args.weekly_snapshot_day:
-                path = write_weekly_snapshot(
+                path = review.write_weekly_snapshot(
                     config.journal_path,
                     config.no_trade_journal_path,
                     now.date().isoformat(),
@@ -1379,43 +1562,27 @@ def handle_run_daily(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_run_sync(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     while True:
-        order_list = build_order_list(client, args.limit)
-        updated_entries = sync_entry_prices(config.journal_path, order_list)
-        updated_trade_ids = sync_exits(config.journal_path, order_list)
-        applied_reviews = apply_pending_reviews(
-            config.journal_path, config.pending_reviews_path
-        )
-        if updated_trade_ids:
-            rows = list_review_queue(config.review_queue_path)
-            queued = {row["trade_id"] for row in rows}
-            journal_rows = list(read_rows(config.journal_path))
-            row_by_id = {row["trade_id"]: row for row in journal_rows}
-            for trade_id in updated_trade_ids:
-                if trade_id in queued:
-                    continue
-                row = row_by_id.get(trade_id)
-                if not row or row.get("outcome"):
-                    continue
-                enqueue_review(
-                    config.review_queue_path,
-                    trade_id=trade_id,
-                    symbol=row["symbol"],
-                    exit_ts=row["exit_ts"],
-                    exit_price=row["exit_price"],
-                )
-                print(f"Review needed: trade_id={trade_id}")
+        order_list = build_order_list(client, args.limit, config)
+        journal = JournalStore(config.journal_path)
+        updated_entries = sync_entry_prices(journal, order_list)
+        updated_trade_ids = sync_exits(journal, order_list)
+        reviews = apply_pending_reviews(journal, config.pending_reviews_path)
+        journal.flush()
+        _enqueue_exit_reviews(config, journal, updated_trade_ids, announce=True)
         print(
             "Synced journal:"
             f" entry_prices={updated_entries} exit_fields={len(updated_trade_ids)}"
-            f" applied_reviews={applied_reviews}"
+            f" applied_reviews={reviews.applied}"
+            f" deferred_reviews={reviews.deferred}"
+            f" duplicate_reviews={reviews.duplicated}"
         )
         time.sleep(args.interval_minutes * 60)
 
 
 def handle_run_once(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     symbols = [
         value.strip()
         for value in (args.symbols or args.symbol).split(",")
@@ -1544,8 +1711,18 @@ def handle_execution_ledger(config: AppConfig, args: argparse.Namespace) -> None
             )
 
 
-def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+@dataclass(frozen=True)
+class ApproveSignalResult:
+    signal_id: str
+    status: str
+    trade_id: str = ""
+    guard: str = ""
+    reason: str = ""
+
+
+def approve_signal(
+    config: AppConfig, client: AlpacaClient, args: argparse.Namespace
+) -> ApproveSignalResult:
     rows = list_signal_queue(config.signal_queue_path, status="pending")
     match = next((row for row in rows if row["signal_id"] == args.signal_id), None)
     if not match:
@@ -1555,8 +1732,9 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
     if limit_price is not None:
         limit_price = float(limit_price)
     qty = float(match.get("qty") or config.fixed_position_size)
+    snapshot = MarketSnapshot(client)
     cap_allowed, cap_message = _capital_guard(
-        client=client,
+        snapshot=snapshot,
         config=config,
         symbol=match["symbol"],
         qty=qty,
@@ -1570,17 +1748,18 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
             status="ignored",
             decision_reason=cap_message,
         )
-        print(
-            f"Signal ignored due to capital cap: signal_id={args.signal_id} "
-            f"reason={cap_message}"
+        return ApproveSignalResult(
+            signal_id=args.signal_id,
+            status="ignored",
+            guard="capital cap",
+            reason=cap_message,
         )
-        return
     risk_allowed, risk_message = _risk_guard(
-        client=client,
+        snapshot=snapshot,
         config=config,
         symbol=match["symbol"],
         direction=match["direction"],
-        stop_loss_logic=match["stop_loss_logic"],
+        stop_price=row_stop_price(match),
         qty=qty,
         order_type=order_type,
         limit_price=limit_price,
@@ -1592,18 +1771,20 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
             status="ignored",
             decision_reason=risk_message,
         )
-        print(
-            f"Signal ignored due to risk cap: signal_id={args.signal_id} "
-            f"reason={risk_message}"
+        return ApproveSignalResult(
+            signal_id=args.signal_id,
+            status="ignored",
+            guard="risk cap",
+            reason=risk_message,
         )
-        return
     stop_price, take_profit_price, bracket_error = _derive_bracket_prices(
-        client=client,
+        snapshot=snapshot,
         symbol=match["symbol"],
         direction=match["direction"],
         order_type=order_type,
         limit_price=limit_price,
-        stop_loss_logic=match["stop_loss_logic"],
+        stop_price=row_stop_price(match),
+        target_r=row_target_r(match),
         take_profit_logic=match["take_profit_logic"],
     )
     if bracket_error:
@@ -1613,11 +1794,12 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
             status="ignored",
             decision_reason=f"bracket derivation failed: {bracket_error}",
         )
-        print(
-            f"Signal ignored due to bracket derivation: signal_id={args.signal_id} "
-            f"reason={bracket_error}"
+        return ApproveSignalResult(
+            signal_id=args.signal_id,
+            status="ignored",
+            guard="bracket derivation",
+            reason=bracket_error,
         )
-        return
     idea = {
         "symbol": match["symbol"],
         "direction": match["direction"],
@@ -1626,6 +1808,8 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
         "invalidation_reason": match["invalidation_reason"],
         "stop_loss_logic": match["stop_loss_logic"],
         "take_profit_logic": match["take_profit_logic"],
+        "stop_price": match.get("stop_price", ""),
+        "target_r": match.get("target_r", ""),
         "market_context": match["market_context"],
         "emotional_state": match["emotional_state"],
     }
@@ -1644,7 +1828,7 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
         order=order,
     )
     entry_price_est = _estimate_entry_price(
-        client=client,
+        snapshot=snapshot,
         symbol=idea["symbol"],
         order_type=order_type,
         limit_price=limit_price,
@@ -1672,21 +1856,41 @@ def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
         status="executed",
         decision_reason=args.reason or "approved",
     )
-    print(f"Approved signal -> trade_id={trade_id}")
+    return ApproveSignalResult(
+        signal_id=args.signal_id,
+        status="executed",
+        trade_id=trade_id,
+        reason=args.reason or "approved",
+    )
 
 
-def handle_ignore_signal(config: AppConfig, args: argparse.Namespace) -> None:
+def handle_approve_signal(config: AppConfig, args: argparse.Namespace) -> None:
+    result = approve_signal(config, _alpaca_client(config), args)
+    if result.status == "ignored":
+        print(
+            f"Signal ignored due to {result.guard}: signal_id={result.signal_id} "
+            f"reason={result.reason}"
+        )
+        return
+    print(f"Approved signal -> trade_id={result.trade_id}")
+
+
+def ignore_signal(config: AppConfig, args: argparse.Namespace) -> None:
     update_signal_status(
         config.signal_queue_path,
         signal_id=args.signal_id,
         status="ignored",
         decision_reason=args.reason or "ignored",
     )
+
+
+def handle_ignore_signal(config: AppConfig, args: argparse.Namespace) -> None:
+    ignore_signal(config, args)
     print(f"Ignored signal: signal_id={args.signal_id}")
 
 
 def handle_close_position(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     trade_id = find_open_trade_id(config.journal_path, args.symbol)
     if not trade_id:
         print("No open trade found for symbol.")
@@ -1735,7 +1939,7 @@ def handle_close_position(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_time_stop_close(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     if args.date:
         if "T" in args.date:
             as_of_date = datetime.fromisoformat(args.date).date()
@@ -1749,10 +1953,10 @@ def handle_time_stop_close(config: AppConfig, args: argparse.Namespace) -> None:
     time_stop_min_r = (
         args.time_stop_min_r if args.time_stop_min_r is not None else config.time_stop_min_r
     )
+    journal = JournalStore(config.journal_path)
+    trades = _open_trade_frame(MarketSnapshot(client), journal, as_of_date=as_of_date)
     due = _time_stop_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        as_of_date=as_of_date,
+        trades,
         time_stop_days=time_stop_days,
         time_stop_min_r=time_stop_min_r,
     )
@@ -1802,7 +2006,7 @@ def handle_time_stop_close(config: AppConfig, args: argparse.Namespace) -> None:
                 break
             time.sleep(1)
         if filled:
-            stop_price = _extract_stop_price(row.get("stop_loss_logic", ""))
+            stop_price = row.get("stop_price")
             entry_price = float(row.get("entry_price") or 0)
             exit_price = float(filled.filled_avg_price)
             direction = row.get("direction") or "long"
@@ -1817,6 +2021,8 @@ def handle_time_stop_close(config: AppConfig, args: argparse.Namespace) -> None:
                 outcome = "loss"
             else:
                 outcome = "scratch"
+            # Write through the path rather than the snapshot loaded above: other
+            # commands may have changed the journal while this one waited on fills.
             log_exit(
                 journal_path=config.journal_path,
                 trade_id=trade_id,
@@ -1850,12 +2056,10 @@ def handle_time_stop_close(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_momentum_close(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
-    due = _momentum_exit_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        min_r_multiple=args.min_r_multiple,
-    )
+    client = _alpaca_client(config)
+    journal = JournalStore(config.journal_path)
+    trades = _open_trade_frame(MarketSnapshot(client), journal)
+    due = _momentum_exit_due_trades(trades, min_r_multiple=args.min_r_multiple)
     target_symbols: set[str] = set()
     if getattr(args, "symbol", None):
         target_symbols.add(args.symbol.strip().upper())
@@ -1902,7 +2106,7 @@ def handle_momentum_close(config: AppConfig, args: argparse.Namespace) -> None:
                 break
             time.sleep(1)
         if filled:
-            stop_price = _extract_stop_price(row.get("stop_loss_logic", ""))
+            stop_price = row.get("stop_price")
             entry_price = float(row.get("entry_price") or 0)
             exit_price = float(filled.filled_avg_price)
             direction = row.get("direction") or "long"
@@ -1917,6 +2121,8 @@ def handle_momentum_close(config: AppConfig, args: argparse.Namespace) -> None:
                 outcome = "loss"
             else:
                 outcome = "scratch"
+            # Write through the path rather than the snapshot loaded above: other
+            # commands may have changed the journal while this one waited on fills.
             log_exit(
                 journal_path=config.journal_path,
                 trade_id=trade_id,
@@ -1949,7 +2155,7 @@ def handle_momentum_close(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_prioritize_pending(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     scored = _prioritize_pending_signals(
         client=client,
         config=config,
@@ -1985,7 +2191,7 @@ def handle_prioritize_pending(config: AppConfig, args: argparse.Namespace) -> No
 
 
 def handle_decision_quality(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     rows = list_signal_queue(config.signal_queue_path, status=None)
     cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=args.lookback_days)
     decided = []
@@ -2011,7 +2217,7 @@ def handle_decision_quality(config: AppConfig, args: argparse.Namespace) -> None
         symbol = row.get("symbol", "").upper()
         if not symbol:
             continue
-        stop = _extract_stop_price(row.get("stop_loss_logic", ""))
+        stop = row_stop_price(row)
         if stop is None:
             totals["unresolved"] += 1
             continue
@@ -2124,7 +2330,7 @@ def handle_weekly_profile_compare(config: AppConfig, args: argparse.Namespace) -
 
 
 def handle_backtest(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     if args.recent_days:
         end = args.end or pd.Timestamp.now(tz="UTC").date().isoformat()
         start = (
@@ -2138,7 +2344,7 @@ def handle_backtest(config: AppConfig, args: argparse.Namespace) -> None:
         end = args.end
     if not args.recent_days and (not start or not end):
         raise RuntimeError("start and end are required unless --recent-days is used.")
-    result = run_backtest(
+    result = backtest.run_backtest(
         client=client,
         symbol=args.symbol,
         start=start or "",
@@ -2160,7 +2366,7 @@ def handle_backtest(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_backtest_summary(config: AppConfig, args: argparse.Namespace) -> None:
-    summary = summarize_backtest(args.trades_path)
+    summary = backtest.summarize_backtest(args.trades_path)
     yearly = summary["yearly"]
     monthly = summary["monthly"]
     if not yearly and not monthly:
@@ -2188,7 +2394,7 @@ def handle_backtest_rollup(config: AppConfig, args: argparse.Namespace) -> None:
     else:
         today = date_cls.today().isoformat()
         output_path = f"knowledge/reviews/monthly_backtest_rollup_{today}.md"
-    path = write_backtest_rollup(
+    path = backtest.write_backtest_rollup(
         input_glob=args.glob,
         months=args.months,
         output_path=output_path,
@@ -2197,14 +2403,14 @@ def handle_backtest_rollup(config: AppConfig, args: argparse.Namespace) -> None:
 
 
 def handle_assess_signal(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     rows = list_signal_queue(config.signal_queue_path, status="pending")
     match = next((row for row in rows if row["signal_id"] == args.signal_id), None)
     if not match:
         raise RuntimeError("Signal not found or not pending.")
     setup_name = match["setup_name"]
     output_path = args.output or f"data/backtest_recent_{setup_name}.csv"
-    result = run_recent_backtest(
+    result = backtest.run_recent_backtest(
         client=client,
         symbol=match["symbol"],
         recent_days=args.recent_days,
@@ -2234,6 +2440,9 @@ def _loss_streak(outcomes: list[str]) -> int:
     return streak
 
 
+_HOT_ONLY_STATE_LOCK = threading.Lock()
+
+
 def _load_hot_only_state(path: str) -> dict[tuple[str, str], dict]:
     state: dict[tuple[str, str], dict] = {}
     if not os.path.exists(path):
@@ -2270,6 +2479,17 @@ def _save_hot_only_state(path: str, state: dict[tuple[str, str], dict]) -> None:
         writer.writerows(rows)
 
 
+def _store_hot_only_state_row(
+    path: str, state_key: tuple[str, str], state_row: dict
+) -> None:
+    # Reload under the lock so concurrent assessments of other symbols/setups
+    # keep their rows.
+    with _HOT_ONLY_STATE_LOCK:
+        hot_state = _load_hot_only_state(path)
+        hot_state[state_key] = state_row
+        _save_hot_only_state(path, hot_state)
+
+
 def _closed_trade_outcomes(
     journal_path: str,
     symbol: str,
@@ -2291,8 +2511,28 @@ def _closed_trade_outcomes(
     return [value[1] for value in filtered]
 
 
-def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+@dataclass(frozen=True)
+class AssessMultiResult:
+    signal_id: str
+    symbol: str
+    setup_name: str
+    recommendation: str
+    results: dict[int, BacktestResult]
+    avg_r_30: float
+    avg_r_90: float
+    avg_r_180: float
+    median_r_180: float
+    hot_ratio: float
+    hot_paused: bool
+    output_path: str
+
+
+def assess_multi(
+    config: AppConfig,
+    client: AlpacaClient,
+    args: argparse.Namespace,
+    results: dict[int, BacktestResult] | None = None,
+) -> AssessMultiResult:
     rows = list_signal_queue(config.signal_queue_path, status="pending")
     match = next((row for row in rows if row["signal_id"] == args.signal_id), None)
     if not match:
@@ -2304,23 +2544,23 @@ def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
     if not windows:
         raise ValueError("No valid windows provided.")
 
-    results: dict[int, BacktestResult] = {}
-    for window in windows:
-        output_path = os.path.join(
-            args.output_dir,
-            f"backtest_assess_{symbol}_{setup_name}_{window}d.csv",
-        )
-        result = run_recent_backtest(
+    if results is None:
+        results = backtest.run_recent_backtests(
             client=client,
             symbol=symbol,
-            recent_days=window,
+            windows=windows,
             risk_multiple=args.risk_multiple,
             time_stop_days=args.time_stop_days,
-            output_path=output_path,
+            output_paths={
+                window: os.path.join(
+                    args.output_dir,
+                    f"backtest_assess_{symbol}_{setup_name}_{window}d.csv",
+                )
+                for window in windows
+            },
             setup_name=setup_name,
             regime_filter=_regime_filter(config) if args.use_regime else None,
         )
-        results[window] = result
 
     def _metric(window: int, name: str, default: float = 0.0) -> float:
         result = results.get(window)
@@ -2354,7 +2594,8 @@ def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
     )
 
     state_key = (symbol.upper(), setup_name)
-    hot_state = _load_hot_only_state(args.state_path)
+    with _HOT_ONLY_STATE_LOCK:
+        hot_state = _load_hot_only_state(args.state_path)
     state_row = hot_state.get(
         state_key,
         {
@@ -2419,8 +2660,7 @@ def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
     state_row["pause_reason"] = pause_reason
     state_row["close_count_at_pause"] = str(close_count_at_pause)
     state_row["updated_ts"] = now_ts
-    hot_state[state_key] = state_row
-    _save_hot_only_state(args.state_path, hot_state)
+    _store_hot_only_state_row(args.state_path, state_key, state_row)
 
     today = date_cls.today().isoformat()
     output_path = args.output or (
@@ -2482,11 +2722,29 @@ def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
     with open(output_path, "w", encoding="utf-8") as file:
         file.write("\n".join(lines) + "\n")
 
-    print(f"recommendation: {recommendation}")
-    print(f"wrote_assess_multi: {output_path}")
+    return AssessMultiResult(
+        signal_id=match["signal_id"],
+        symbol=symbol,
+        setup_name=setup_name,
+        recommendation=recommendation,
+        results=results,
+        avg_r_30=avg_r_30,
+        avg_r_90=avg_r_90,
+        avg_r_180=avg_r_180,
+        median_r_180=median_r_180,
+        hot_ratio=hot_ratio,
+        hot_paused=is_paused,
+        output_path=output_path,
+    )
+
+
+def handle_assess_multi(config: AppConfig, args: argparse.Namespace) -> None:
+    result = assess_multi(config, _alpaca_client(config), args)
+    print(f"recommendation: {result.recommendation}")
+    print(f"wrote_assess_multi: {result.output_path}")
 
 def handle_review_snapshot(config: AppConfig, args: argparse.Namespace) -> None:
-    path = write_weekly_snapshot(
+    path = review.write_weekly_snapshot(
         config.journal_path,
         config.no_trade_journal_path,
         args.date,
@@ -2497,7 +2755,7 @@ def handle_review_snapshot(config: AppConfig, args: argparse.Namespace) -> None:
 
 def handle_no_trade_summary(config: AppConfig, args: argparse.Namespace) -> None:
     days = 1 if args.window == "daily" else 7
-    summary = no_trade_summary(config.no_trade_journal_path, args.date, days)
+    summary = review.no_trade_summary(config.no_trade_journal_path, args.date, days)
     print(f"total_no_trades: {summary['total_no_trades']}")
     print(f"top_reason: {summary['top_reason']}")
     print(f"top_context: {summary['top_context']}")
@@ -2505,7 +2763,7 @@ def handle_no_trade_summary(config: AppConfig, args: argparse.Namespace) -> None
 
 
 def handle_backtest_batch(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     symbols = (
         [value.strip().upper() for value in args.symbols.split(",") if value.strip()]
         if args.symbols
@@ -2519,35 +2777,101 @@ def handle_backtest_batch(config: AppConfig, args: argparse.Namespace) -> None:
     windows = [int(value) for value in args.windows.split(",") if value.strip()]
     regime_filter = _regime_filter(config) if args.use_regime else None
 
-    for symbol in symbols:
-        for setup in setups:
-            for window in windows:
-                output = f"{args.output_dir}/backtest_{symbol}_{setup}_{window}d.csv"
-                end = pd.Timestamp.now(tz="UTC").date().isoformat()
-                start = (
-                    pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=window * 3)
-                ).date().isoformat()
-                result = run_backtest(
-                    client=client,
-                    symbol=symbol,
-                    start=start,
-                    end=end,
-                    risk_multiple=args.risk_multiple,
-                    time_stop_days=args.time_stop_days,
-                    output_path=output,
-                    setup_name=setup,
-                    recent_days=window,
-                    regime_filter=regime_filter,
-                )
-                print(
-                    f"{symbol} {setup} {window}d "
-                    f"trades={result.total_trades} win_rate={result.win_rate:.2f} "
-                    f"avg_r={result.avg_r:.2f}"
-                )
+    _run_backtest_windows(
+        client,
+        [(symbol, setup) for symbol in symbols for setup in setups],
+        windows,
+        args,
+        regime_filter,
+    )
+
+
+def handle_backtest_windows(config: AppConfig, args: argparse.Namespace) -> None:
+    client = _alpaca_client(config)
+    pairs: list[tuple[str, str]] = []
+    if args.pairs_path:
+        with open(args.pairs_path, "r", encoding="utf-8") as file:
+            for line in file:
+                parts = line.strip().split("\t")
+                if len(parts) < 2 or not parts[0] or not parts[1]:
+                    continue
+                pairs.append((parts[0].upper(), parts[1]))
+    if args.symbol:
+        pairs.append((args.symbol.upper(), args.setup))
+    if not pairs:
+        raise RuntimeError("Provide --symbol or --pairs-path.")
+    windows = [int(value) for value in args.windows.split(",") if value.strip()]
+    if not windows:
+        raise ValueError("No valid windows provided.")
+    regime_filter = _regime_filter(config) if args.use_regime else None
+    _run_backtest_windows(client, pairs, windows, args, regime_filter)
+
+
+def _run_backtest_windows(
+    client: AlpacaClient,
+    pairs: list[tuple[str, str]],
+    windows: list[int],
+    args: argparse.Namespace,
+    regime_filter: dict | None,
+) -> None:
+    now = pd.Timestamp.now(tz="UTC")
+    end = now.date().isoformat()
+    longest_start = (now - pd.Timedelta(days=max(windows) * 3)).date().isoformat()
+    symbols = list(dict.fromkeys(symbol for symbol, _ in pairs))
+    bars_by_symbol = client.get_daily_bars_many(symbols, longest_start, end)
+    jobs = [
+        {
+            "symbol": symbol,
+            "setup": setup,
+            "bars": bars_by_symbol.get(symbol, pd.DataFrame()),
+            "windows": windows,
+            "risk_multiple": args.risk_multiple,
+            "time_stop_days": args.time_stop_days,
+            "output_dir": args.output_dir,
+            "regime_filter": regime_filter,
+        }
+        for symbol, setup in pairs
+    ]
+    if args.workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            _print_backtest_window_results(
+                jobs, executor.map(_run_backtest_windows_job, jobs)
+            )
+    else:
+        _print_backtest_window_results(jobs, map(_run_backtest_windows_job, jobs))
+
+
+def _print_backtest_window_results(jobs: list[dict], job_results) -> None:
+    for job, results in zip(jobs, job_results):
+        for window, result in results.items():
+            print(
+                f"{job['symbol']} {job['setup']} {window}d "
+                f"trades={result.total_trades} win_rate={result.win_rate:.2f} "
+                f"avg_r={result.avg_r:.2f}"
+            )
+
+
+def _run_backtest_windows_job(job: dict) -> dict[int, BacktestResult]:
+    symbol = job["symbol"]
+    setup = job["setup"]
+    return backtest.run_recent_backtests(
+        client=None,
+        symbol=symbol,
+        windows=job["windows"],
+        risk_multiple=job["risk_multiple"],
+        time_stop_days=job["time_stop_days"],
+        output_paths={
+            window: f"{job['output_dir']}/backtest_{symbol}_{setup}_{window}d.csv"
+            for window in job["windows"]
+        },
+        setup_name=setup,
+        regime_filter=job["regime_filter"],
+        bars=job["bars"],
+    )
 
 
 def handle_backtest_portfolio(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+    client = _alpaca_client(config)
     if args.recent_days:
         end = args.end or pd.Timestamp.now(tz="UTC").date().isoformat()
         start = (
@@ -2607,7 +2931,7 @@ def handle_backtest_portfolio(config: AppConfig, args: argparse.Namespace) -> No
         else config.max_total_open_risk_usd
     )
 
-    result = run_portfolio_backtest(
+    result = backtest.run_portfolio_backtest(
         client=client,
         symbol_setups=symbol_setups,
         start=start or "",
@@ -2645,27 +2969,38 @@ def handle_backtest_portfolio(config: AppConfig, args: argparse.Namespace) -> No
     print(f"constrained_avg_r: {result.constrained_avg_r:.2f}")
 
 
-def handle_scan(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
+@dataclass(frozen=True)
+class ScanResult:
+    symbols_scanned: int
+    ideas: list[dict]
+    output_path: str
+
+
+def run_scan(
+    config: AppConfig, client: AlpacaClient, args: argparse.Namespace
+) -> ScanResult:
     symbols = (
         [value.strip().upper() for value in args.symbols.split(",") if value.strip()]
         if args.symbols
         else _read_universe(args.universe_path or config.universe_path)
     )
     regime_filter = _regime_filter(config)
-    ideas: list[dict] = []
-    for symbol in symbols:
-        if symbol in config.watch_only_symbols and not args.include_watch_only:
-            continue
-        allowed_setups = _allowed_setups_for_symbol(config, symbol)
-        idea = find_trade_idea(
-            client,
-            symbol,
-            allowed_setups,
-            regime_filter=regime_filter,
-        )
-        if idea:
-            ideas.append(idea)
+    scan_symbols = [
+        symbol
+        for symbol in symbols
+        if symbol not in config.watch_only_symbols or args.include_watch_only
+    ]
+    bars_by_symbol = _recent_daily_bars_many(client, scan_symbols)
+    ideas = trade_logic.scan_universe(
+        {
+            symbol: bars_by_symbol[symbol]
+            for symbol in scan_symbols
+            if symbol in bars_by_symbol
+        },
+        {symbol: _allowed_setups_for_symbol(config, symbol) for symbol in scan_symbols},
+        regime_filter,
+        daily_bar_ready_time=client.daily_bar_ready_time,
+    )
 
     if args.output:
         output_path = args.output
@@ -2696,7 +3031,14 @@ def handle_scan(config: AppConfig, args: argparse.Namespace) -> None:
         os.makedirs(output_dir, exist_ok=True)
     with open(output_path, "w", encoding="utf-8") as file:
         file.write("\n".join(lines) + "\n")
-    print(f"wrote_scan: {output_path}")
+    return ScanResult(
+        symbols_scanned=len(symbols), ideas=ideas, output_path=output_path
+    )
+
+
+def handle_scan(config: AppConfig, args: argparse.Namespace) -> None:
+    result = run_scan(config, _alpaca_client(config), args)
+    print(f"wrote_scan: {result.output_path}")
 
 
 def _to_float(value: str) -> float | None:
@@ -3026,21 +3368,17 @@ def handle_go_live_snapshot(config: AppConfig, args: argparse.Namespace) -> None
 
 
 def handle_ops_report(config: AppConfig, args: argparse.Namespace) -> None:
-    client = AlpacaClient(config)
-    open_exposure = _open_exposure_usd(client)
-    open_risk = _open_risk_to_stops_usd(client, config.journal_path)
+    snapshot = MarketSnapshot(_alpaca_client(config))
+    open_exposure = _open_exposure_usd(snapshot)
+    journal = JournalStore(config.journal_path)
+    open_risk = _open_risk_to_stops_usd(snapshot, journal)
+    trades = _open_trade_frame(snapshot, journal, as_of_date=date_cls.today())
     time_stop_due = _time_stop_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        as_of_date=date_cls.today(),
+        trades,
         time_stop_days=config.time_stop_days,
         time_stop_min_r=config.time_stop_min_r,
     )
-    momentum_due = _momentum_exit_due_trades(
-        client=client,
-        journal_path=config.journal_path,
-        min_r_multiple=1.0,
-    )
+    momentum_due = _momentum_exit_due_trades(trades, min_r_multiple=1.0)
     fetch_status = _load_last_fetch_status("data/server_runs_remote")
     fetch_state = "unknown"
     fetch_last_ts = ""
@@ -3214,6 +3552,20 @@ def handle_analyze_latest_run(config: AppConfig, args: argparse.Namespace) -> No
             )
 
 
+def handle_storage_copy(config: AppConfig, args: argparse.Namespace) -> None:
+    configured_paths = {
+        "journal": config.journal_path,
+        "no_trade_journal": config.no_trade_journal_path,
+        "pending_reviews": config.pending_reviews_path,
+        "review_queue": config.review_queue_path,
+        "signal_queue": config.signal_queue_path,
+        "execution_ledger": config.execution_ledger_path,
+    }
+    source = args.source or configured_paths[args.kind]
+    copied = copy_store(source, args.dest, STORE_FIELDNAMES[args.kind])
+    print(f"storage_copy kind={args.kind} rows={copied} source={source} dest={args.dest}")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="V0 paper-trading system")
     parser.add_argument(
@@ -3221,8 +3573,22 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Config file path (overrides CONFIG_PATH env for this run)",
     )
+    parser.add_argument(
+        "--server",
+        default=os.getenv("SERVE_SOCKET_PATH", ""),
+        help="Forward the command to a running `serve` process on this socket",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
 
+    serve_parser = subparsers.add_parser(
+        "serve", help="Run commands from a local socket in one warm process"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        default=os.getenv("SERVE_SOCKET_PATH", "") or "data/cdx.sock",
+        help="Unix socket path to listen on",
+    )
+
     trade_parser = subparsers.add_parser("trade", help="Evaluate and place a trade")
     trade_parser.add_argument("--symbol", required=True, help="Symbol to evaluate")
     trade_parser.add_argument(
@@ -3357,6 +3723,11 @@ def build_parser() -> argparse.ArgumentParser:
         default=50,
         help="Number of recent closed orders to scan",
     )
+    sync_parser.add_argument(
+        "--ledger-sleeve-only",
+        action="store_true",
+        help="Only reconcile execution ledger rows for this sleeve",
+    )
 
     run_parser = subparsers.add_parser("run-daily", help="Run once after market close")
     run_parser.set_defaults(
@@ -4367,6 +4738,64 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Apply regime filter to batch backtests",
     )
+    backtest_batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for setup/window simulations (1 = serial)",
+    )
+
+    backtest_windows_parser = subparsers.add_parser(
+        "backtest-windows",
+        help="Backtest several recent windows per symbol/setup from one fetch",
+    )
+    backtest_windows_parser.add_argument(
+        "--symbol", default=None, help="Symbol to test"
+    )
+    backtest_windows_parser.add_argument(
+        "--setup",
+        choices=["PrevDayBreakout_D1", "MeanReversion_D1", "TwoDayBreakout_D1"],
+        default="PrevDayBreakout_D1",
+        help="Setup to backtest with --symbol",
+    )
+    backtest_windows_parser.add_argument(
+        "--pairs-path",
+        default=None,
+        help="Tab-separated symbol/setup pairs file, one pair per line",
+    )
+    backtest_windows_parser.add_argument(
+        "--windows",
+        default="30,90,180",
+        help="Comma-separated recent-day windows",
+    )
+    backtest_windows_parser.add_argument(
+        "--risk-multiple",
+        type=float,
+        default=2.0,
+        help="Take profit multiple (R)",
+    )
+    backtest_windows_parser.add_argument(
+        "--time-stop-days",
+        type=int,
+        default=5,
+        help="Max holding days before time stop",
+    )
+    backtest_windows_parser.add_argument(
+        "--output-dir",
+        default="data",
+        help="Directory to write backtest_{symbol}_{setup}_{window}d.csv files",
+    )
+    backtest_windows_parser.add_argument(
+        "--use-regime",
+        action="store_true",
+        help="Apply regime filter to backtest signals",
+    )
+    backtest_windows_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for symbol/setup simulations (1 = serial)",
+    )
 
     backtest_portfolio_parser = subparsers.add_parser(
         "backtest-portfolio",
@@ -4522,16 +4951,31 @@ def build_parser() -> argparse.ArgumentParser:
         help="Anchor date (YYYY-MM-DD). Defaults to today.",
     )
 
+    storage_copy_parser = subparsers.add_parser(
+        "storage-copy",
+        help="Copy a journal store between CSV and SQLite (import/export)",
+    )
+    storage_copy_parser.add_argument(
+        "--kind",
+        choices=sorted(STORE_FIELDNAMES),
+        required=True,
+        help="Which store to copy",
+    )
+    storage_copy_parser.add_argument(
+        "--source",
+        default=None,
+        help="Source path (defaults to the configured path for --kind)",
+    )
+    storage_copy_parser.add_argument(
+        "--dest",
+        required=True,
+        help="Destination path; .db/.sqlite/.sqlite3 (optionally #table) writes SQLite",
+    )
+
     return parser
 
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
-    if args.config:
-        os.environ["CONFIG_PATH"] = args.config
-
-    config = AppConfig.from_env()
+def init_stores(config: AppConfig) -> None:
     init_journal(config.journal_path)
     init_no_trade_journal(config.no_trade_journal_path)
     init_pending_reviews(config.pending_reviews_path)
@@ -4539,7 +4983,54 @@ def main() -> None:
     init_signal_queue(config.signal_queue_path)
     init_execution_ledger(config.execution_ledger_path)
 
-    if args.command == "trade":
+
+def load_config(config_path: str | None = None) -> AppConfig:
+    config = AppConfig.from_env(config_path)
+    init_stores(config)
+    return config
+
+
+def command_args(command: str, *argv: str, **overrides) -> argparse.Namespace:
+    args = build_parser().parse_args([command, *argv])
+    for key, value in overrides.items():
+        setattr(args, key, value)
+    return args
+
+
+SERVE_LOCAL_ONLY_COMMANDS = {"serve", "run-daily", "run-sync"}
+
+
+def handle_serve(config: AppConfig, args: argparse.Namespace) -> None:
+    serve(args.socket, _run_served_command)
+
+
+def _run_served_command(argv: list[str], config_path: str | None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command in SERVE_LOCAL_ONLY_COMMANDS:
+        raise SystemExit(f"{args.command} does not run inside serve")
+    dispatch(load_config(args.config or config_path), args)
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.server and args.command not in SERVE_LOCAL_ONLY_COMMANDS:
+        rc = forward(
+            args.server, sys.argv[1:], args.config or os.getenv("CONFIG_PATH")
+        )
+        if rc is not None:
+            raise SystemExit(rc)
+    if args.config:
+        os.environ["CONFIG_PATH"] = args.config
+
+    config = load_config()
+    dispatch(config, args)
+
+
+def dispatch(config: AppConfig, args: argparse.Namespace) -> None:
+    if args.command == "serve":
+        handle_serve(config, args)
+    elif args.command == "trade":
         handle_trade(config, args)
     elif args.command == "signal":
         handle_signal(config, args)
@@ -4587,6 +5078,8 @@ def main() -> None:
         handle_backtest_rollup(config, args)
     elif args.command == "backtest-batch":
         handle_backtest_batch(config, args)
+    elif args.command == "backtest-windows":
+        handle_backtest_windows(config, args)
     elif args.command == "backtest-portfolio":
         handle_backtest_portfolio(config, args)
     elif args.command == "review-snapshot":
@@ -4611,6 +5104,8 @@ def main() -> None:
         handle_analyze_latest_run(config, args)
     elif args.command == "scan":
         handle_scan(config, args)
+    elif args.command == "storage-copy":
+        handle_storage_copy(config, args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+
+PAGE_SIZE = 500
+MAX_CACHED_ORDERS = 2000
+CURSOR_OVERLAP = timedelta(minutes=5)
+TIMESTAMP_FIELDS = ("created_at", "submitted_at", "updated_at", "filled_at")
+TERMINAL_STATUSES = {"filled", "canceled", "expired", "rejected", "replaced"}
+_SYNC_LOCK = threading.Lock()
+
+
+def order_record(order) -> dict:
+    created_at = order.created_at
+    return {
+        "order_id": str(order.id),
+        "symbol": order.symbol,
+        "side": order.side.value if hasattr(order.side, "value") else order.side,
+        "created_at": created_at,
+        "submitted_at": getattr(order, "submitted_at", None) or created_at,
+        "updated_at": getattr(order, "updated_at", None) or created_at,
+        "filled_at": order.filled_at,
+        "filled_avg_price": (
+            float(order.filled_avg_price) if order.filled_avg_price else None
+        ),
+    }
+
+
+class OrderCache:
+    # Closed orders are shared by every sleeve trading the account; each
+    # sleeve keeps its own cursor. Alpaca's after filter matches submission
+    # time, so orders that were still open on the last run (e.g. bracket
+    # legs) are looked up by id once they leave the open list.
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def sync(self, client, sleeve_id: str, limit: int) -> list[dict]:
+        with self._locked():
+            return self._sync(client, sleeve_id, limit)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # The serve daemon and cron jobs can sync the same file; hold the lock
+        # across the whole read-modify-write so neither drops the other's work.
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _SYNC_LOCK, open(f"{self.path}.lock", "a", encoding="utf-8") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def _sync(self, client, sleeve_id: str, limit: int) -> list[dict]:
+        state = self._read()
+        orders = state["orders"]
+        cursor = state["cursors"].get(sleeve_id)
+        fetched_at = datetime.now(timezone.utc)
+        resync = False
+        open_ids = {
+            str(order.id)
+            for order in client.list_recent_orders(limit=PAGE_SIZE, status="open")
+        }
+        if cursor is None:
+            closed = [
+                order_record(order)
+                for order in client.list_recent_orders(limit=limit, status="closed")
+            ]
+            seen_ids: set[str] = set()
+            updated_at = None
+        else:
+            closed = _fetch_closed_after(client, _cursor_after(cursor))
+            seen_ids = set(cursor.get("seen_ids", []))
+            updated_at = _parse(cursor.get("updated_at"))
+            fetched_ids = {record["order_id"] for record in closed}
+            for order_id in cursor.get("open_ids", []):
+                if order_id in open_ids or order_id in fetched_ids:
+                    continue
+                try:
+                    order = client.get_order(order_id)
+                except Exception:
+                    # Purged or unreachable: drop the cursor below so the next
+                    # run starts over with a full fetch.
+                    resync = True
+                    continue
+                if _status_value(order.status) in TERMINAL_STATUSES:
+                    closed.append(order_record(order))
+                else:
+                    open_ids.add(order_id)
+        for record in closed:
+            if record["order_id"] in seen_ids and record["order_id"] in orders:
+                continue
+            orders[record["order_id"]] = _dump(record)
+            if record["updated_at"] and (
+                updated_at is None or record["updated_at"] > updated_at
+            ):
+                updated_at = record["updated_at"]
+
+        next_cursor = {
+            "updated_at": _iso(updated_at or fetched_at),
+            "fetched_at": _iso(fetched_at),
+            "open_ids": sorted(open_ids),
+        }
+        next_after = _cursor_after(next_cursor)
+        next_cursor["seen_ids"] = sorted(
+            order_id
+            for order_id, order in orders.items()
+            if (_parse(order.get("submitted_at")) or next_after) > next_after
+        )
+        if resync:
+            state["cursors"].pop(sleeve_id, None)
+        else:
+            state["cursors"][sleeve_id] = next_cursor
+
+        records = sorted(
+            (_load(order) for order in orders.values()),
+            key=_submitted_key,
+            reverse=True,
+        )
+        records = records[: max(MAX_CACHED_ORDERS, limit)]
+        state["orders"] = {record["order_id"]: _dump(record) for record in records}
+        self._write(state)
+        return records[:limit]
+
+    def _read(self) -> dict:
+        state = {"cursors": {}, "orders": {}}
+        if not os.path.exists(self.path):
+            return state
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return state
+        if isinstance(data, dict):
+            state["cursors"] = data.get("cursors") or {}
+            state["orders"] = data.get("orders") or {}
+        return state
+
+    def _write(self, state: dict) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _fetch_closed_after(client, after: datetime) -> list[dict]:
+    records: dict[str, dict] = {}
+    until = None
+    while True:
+        batch = client.list_recent_orders(
+            limit=PAGE_SIZE, status="closed", after=after, until=until
+        )
+        fresh = [
+            order_record(order) for order in batch if str(order.id) not in records
+        ]
+        for record in fresh:
+            records[record["order_id"]] = record
+        if len(batch) < PAGE_SIZE or not fresh:
+            break
+        # until is exclusive; step past the oldest timestamp so orders sharing
+        # it are fetched again and deduplicated above.
+        until = min(_submitted_key(record) for record in fresh) + timedelta(
+            microseconds=1
+        )
+    return list(records.values())
+
+
+def _cursor_after(cursor: dict) -> datetime:
+    bounds = [
+        value
+        for value in (
+            _parse(cursor.get("updated_at")),
+            _parse(cursor.get("fetched_at")),
+        )
+        if value is not None
+    ]
+    return min(bounds) - CURSOR_OVERLAP
+
+
+def _status_value(status: object) -> str:
+    if hasattr(status, "value"):
+        return str(getattr(status, "value")).lower()
+    return str(status).lower()
+
+
+def _submitted_key(record: dict) -> datetime:
+    return record["submitted_at"] or datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _iso(value: datetime | None) -> str:
+    return value.isoformat() if value else ""
+
+
+def _parse(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _dump(record: dict) -> dict:
+    return {
+        key: _iso(value) if key in TIMESTAMP_FIELDS else value
+        for key, value in record.items()
+    }
+
+
+def _load(order: dict) -> dict:
+    return {
+        key: _parse(value) if key in TIMESTAMP_FIELDS else value
+        for key, value in order.items()
+    }
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 
@@ -24,6 +25,38 @@ def detect_regime(bars: pd.DataFrame, fast_sma: int, slow_sma: int) -> str | Non
     return "neutral"
 
 
+def regime_series(bars: pd.DataFrame, fast_sma: int, slow_sma: int) -> pd.Series:
+    if bars is None or bars.empty:
+        return pd.Series([], dtype=object)
+    if "close" not in bars.columns:
+        return pd.Series([None] * len(bars), index=bars.index, dtype=object)
+    if fast_sma < 1 or slow_sma < 2 or slow_sma <= fast_sma:
+        raise ValueError("fast_sma must be >= 1 and slow_sma must be > fast_sma")
+
+    closes = pd.to_numeric(bars["close"], errors="coerce").to_numpy(dtype=float)
+    valid_mask = ~np.isnan(closes)
+    valid = closes[valid_mask]
+    valid_labels = np.full(len(valid), None, dtype=object)
+    if len(valid) >= slow_sma:
+        # Row sums over window views reduce the same way tail(n).mean() does,
+        # so every label matches detect_regime on the matching prefix.
+        windows = np.lib.stride_tricks.sliding_window_view
+        fast_means = windows(valid, fast_sma).sum(axis=1) / fast_sma
+        slow_means = windows(valid, slow_sma).sum(axis=1) / slow_sma
+        fast_values = fast_means[slow_sma - fast_sma :]
+        valid_labels[slow_sma - 1 :] = np.where(
+            fast_values > slow_means,
+            "trend",
+            np.where(fast_values < slow_means, "range", "neutral"),
+        )
+
+    valid_count = np.cumsum(valid_mask)
+    labels = [
+        valid_labels[count - 1] if count > 0 else None for count in valid_count
+    ]
+    return pd.Series(labels, index=bars.index, dtype=object)
+
+
 def regime_allows(setup_name: str, regime: str | None) -> bool:
     if regime is None:
         return False
@@ -34,3 +67,34 @@ def regime_allows(setup_name: str, regime: str | None) -> bool:
     if setup_name == "MeanReversion_D1":
         return regime == "range"
     return False
+
+
+def latest_regimes(
+    closes: np.ndarray,
+    codes: np.ndarray,
+    count: int,
+    fast_sma: int,
+    slow_sma: int,
+) -> np.ndarray:
+    # closes holds every symbol's bars stacked and ordered by (code, time);
+    # the result is detect_regime's label for each code's full history.
+    if fast_sma < 1 or slow_sma < 2 or slow_sma <= fast_sma:
+        raise ValueError("fast_sma must be >= 1 and slow_sma must be > fast_sma")
+
+    labels = np.full(count, None, dtype=object)
+    valid_mask = ~np.isnan(closes)
+    valid = closes[valid_mask]
+    valid_counts = np.bincount(codes[valid_mask], minlength=count)
+    ready = np.flatnonzero(valid_counts >= slow_sma)
+    if not len(ready):
+        return labels
+    ends = np.cumsum(valid_counts)[ready]
+    windows = valid[ends[:, None] - slow_sma + np.arange(slow_sma)]
+    fast_means = windows[:, slow_sma - fast_sma :].sum(axis=1) / fast_sma
+    slow_means = windows.sum(axis=1) / slow_sma
+    labels[ready] = np.where(
+        fast_means > slow_means,
+        "trend",
+        np.where(fast_means < slow_means, "range", "neutral"),
+    )
+    return labels
@@ -4,9 +4,19 @@ from datetime import datetime, timedelta, timezone
 
 import pandas as pd
 
+from journal import FIELDNAMES, NO_TRADE_FIELDNAMES
+from storage import open_store
+
+
+def _read_frame(path: str, fieldnames: list[str]) -> pd.DataFrame:
+    # Stores hand back text; blank cells become NaN as they did with read_csv.
+    rows = list(open_store(path, fieldnames).read_rows())
+    df = pd.DataFrame(rows, columns=fieldnames)
+    return df.where(df != "")
+
 
 def _load_trades(journal_path: str) -> pd.DataFrame:
-    df = pd.read_csv(journal_path)
+    df = _read_frame(journal_path, FIELDNAMES)
     if df.empty:
         return df
     df["entry_ts"] = pd.to_datetime(df["entry_ts"], errors="coerce")
@@ -16,7 +26,7 @@ def _load_trades(journal_path: str) -> pd.DataFrame:
 
 
 def _load_no_trades(journal_path: str) -> pd.DataFrame:
-    df = pd.read_csv(journal_path)
+    df = _read_frame(journal_path, NO_TRADE_FIELDNAMES)
     if df.empty:
         return df
     df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
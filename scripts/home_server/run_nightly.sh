@@ -41,7 +41,25 @@ notify_pipeline() {
     --failed-step "${CURRENT_STEP}" || true
 }
 
-trap 'notify_pipeline "$?"' EXIT
+stop_server() {
+  if [[ -n "${SERVE_PID:-}" ]]; then
+    kill "${SERVE_PID}" 2>/dev/null || true
+  fi
+}
+
+trap 'rc=$?; stop_server; notify_pipeline "${rc}"' EXIT
+
+if [[ "${USE_SERVE:-0}" == "1" ]]; then
+  # One warm main.py process runs the steps below; each step just forwards
+  # its arguments over the socket (and runs locally if the server is gone).
+  export SERVE_SOCKET_PATH="${RUN_DIR}/serve.sock"
+  "${MAIN_CMD[@]}" serve --socket "${SERVE_SOCKET_PATH}" > "${LOG_DIR}/serve.log" 2>&1 &
+  SERVE_PID=$!
+  for _ in $(seq 1 50); do
+    [[ -S "${SERVE_SOCKET_PATH}" ]] && break
+    sleep 0.2
+  done
+fi
 
 run_cmd() {
   local name="$1"
@@ -102,18 +120,12 @@ run_cmd "signal_queue_pending" "${MAIN_CMD[@]}" signal-queue --status pending --
 run_cmd "signal_queue_executed" "${MAIN_CMD[@]}" signal-queue --status executed --verbose
 run_cmd "signal_queue_ignored" "${MAIN_CMD[@]}" signal-queue --status ignored --verbose
 
-while IFS=$'\t' read -r symbol setup; do
-  [[ -z "${symbol}" || -z "${setup}" ]] && continue
-  for window in 30 90 180; do
-    out="${BACKTEST_DIR}/backtest_${symbol}_${setup}_${window}d.csv"
-    run_cmd "backtest_${symbol}_${setup}_${window}d" \
-      "${MAIN_CMD[@]}" backtest \
-      --symbol "${symbol}" \
-      --setup "${setup}" \
-      --recent-days "${window}" \
-      --output "${out}"
-  done
-done < "${QUEUE_DIR}/symbol_setup_pairs.tsv"
+run_cmd "backtests" \
+  "${MAIN_CMD[@]}" backtest-windows \
+    --pairs-path "${QUEUE_DIR}/symbol_setup_pairs.tsv" \
+    --windows 30,90,180 \
+    --output-dir "${BACKTEST_DIR}" \
+    --workers "${BACKTEST_WORKERS:-1}"
 
 run_cmd "portfolio_constrained" \
   "${MAIN_CMD[@]}" backtest-portfolio \
@@ -2,12 +2,9 @@
 from __future__ import annotations
 
 import argparse
-import csv
-import json
-import re
-import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -17,6 +14,17 @@ if str(ROOT) not in sys.path:
 
 from alpaca_client import AlpacaClient
 from config import AppConfig
+from journal import list_signal_queue
+from main import (
+    approve_signal,
+    assess_multi,
+    command_args,
+    ignore_signal,
+    load_config,
+    run_scan,
+    sync_journal,
+)
+from storage import store_exists
 
 
 DEFAULT_SLEEVES = [
@@ -30,6 +38,7 @@ DEFAULT_SLEEVES = [
 
 @dataclass
 class PendingSignal:
+    config: AppConfig
     config_path: str
     sleeve_id: str
     signal_id: str
@@ -80,81 +89,89 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Mark rejected recommendations as ignored",
     )
+    parser.add_argument(
+        "--assess-workers",
+        type=int,
+        default=4,
+        help="Symbols assessed concurrently",
+    )
     return parser.parse_args()
 
 
-def run_main(config_path: str, command: list[str]) -> tuple[int, str]:
-    cmd = [sys.executable, "main.py", "--config", config_path, *command]
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    output = (result.stdout or "") + (result.stderr or "")
-    return result.returncode, output
-
-
-def load_config(config_path: str) -> dict:
-    with open(config_path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-
-def load_pending_signals(config_path: str, signal_queue_path: str, sleeve_id: str) -> list[PendingSignal]:
-    p = Path(signal_queue_path)
-    if not p.exists():
+def load_pending_signals(config: AppConfig) -> list[PendingSignal]:
+    if not store_exists(config.signal_queue_path):
         return []
     rows: list[PendingSignal] = []
-    with p.open("r", newline="", encoding="utf-8") as f:
-        for row in csv.DictReader(f):
-            if row.get("status") != "pending":
-                continue
-            rows.append(
-                PendingSignal(
-                    config_path=config_path,
-                    sleeve_id=sleeve_id,
-                    signal_id=row["signal_id"],
-                    symbol=row["symbol"],
-                    setup_name=row.get("setup_name", ""),
-                    created_ts=row.get("created_ts", ""),
-                )
+    for row in list_signal_queue(config.signal_queue_path, status="pending"):
+        rows.append(
+            PendingSignal(
+                config=config,
+                config_path=config.config_path,
+                sleeve_id=config.sleeve_id,
+                signal_id=row["signal_id"],
+                symbol=row["symbol"],
+                setup_name=row.get("setup_name", ""),
+                created_ts=row.get("created_ts", ""),
             )
+        )
     return rows
 
 
-def parse_assess_metrics(markdown_path: str) -> tuple[float, str]:
-    avg_r_180 = -999.0
-    note = ""
-    try:
-        text = Path(markdown_path).read_text(encoding="utf-8")
-    except Exception as exc:
-        return avg_r_180, f"read_error={exc}"
-    m = re.search(r"avg_r_180=([-+]?[0-9]*\.?[0-9]+)", text)
-    if m:
-        avg_r_180 = float(m.group(1))
-    hm = re.search(r"hot_ratio=([-+]?[0-9]*\.?[0-9]+)", text)
-    if hm:
-        note = f"hot_ratio={hm.group(1)}"
-    return avg_r_180, note
-
-
-def assess_signal(signal: PendingSignal) -> PendingSignal:
+def assess_signal(
+    client: AlpacaClient, signal: PendingSignal, shared: dict[tuple, dict]
+) -> PendingSignal:
     with tempfile.NamedTemporaryFile(prefix="assess_multi_", suffix=".md", delete=False) as tmp:
         output_path = tmp.name
-    rc, out = run_main(
-        signal.config_path,
-        ["assess-multi", "--signal-id", signal.signal_id, "--output", output_path],
+    args = command_args(
+        "assess-multi", "--signal-id", signal.signal_id, "--output", output_path
+    )
+    regime = (
+        (
+            signal.config.regime_filter_enabled,
+            signal.config.regime_fast_sma,
+            signal.config.regime_slow_sma,
+        )
+        if args.use_regime
+        else None
     )
-    if rc != 0:
+    key = (signal.setup_name, regime)
+    try:
+        result = assess_multi(signal.config, client, args, results=shared.get(key))
+    except Exception as exc:
         signal.recommendation = "error"
-        signal.assess_note = "assess_failed"
+        signal.assess_note = f"assess_failed={exc}"
         return signal
-    rm = re.search(r"recommendation:\s*(\w+)", out)
-    signal.recommendation = rm.group(1).strip().lower() if rm else "unknown"
-    avg_r_180, note = parse_assess_metrics(output_path)
-    signal.avg_r_180 = avg_r_180
-    signal.assess_note = note
+    shared[key] = result.results
+    signal.recommendation = result.recommendation
+    signal.avg_r_180 = result.avg_r_180
+    signal.assess_note = f"hot_ratio={result.hot_ratio:.2f}"
     return signal
 
 
-def get_live_blocked_symbols() -> set[str]:
-    cfg = AppConfig.from_env()
-    client = AlpacaClient(cfg)
+def assess_symbol(client: AlpacaClient, signals: list[PendingSignal]) -> None:
+    # Signals for one symbol run in queue order on one worker: setups share
+    # their backtests, and the symbol's bar-cache files have a single writer.
+    shared: dict[tuple, dict] = {}
+    for signal in signals:
+        assess_signal(client, signal, shared)
+
+
+def assess_signals(
+    client: AlpacaClient, signals: list[PendingSignal], workers: int
+) -> list[PendingSignal]:
+    by_symbol: dict[str, list[PendingSignal]] = {}
+    for signal in signals:
+        by_symbol.setdefault(signal.symbol.upper(), []).append(signal)
+    if workers <= 1 or len(by_symbol) <= 1:
+        for group in by_symbol.values():
+            assess_symbol(client, group)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda group: assess_symbol(client, group), by_symbol.values()))
+    return signals
+
+
+def get_live_blocked_symbols(client: AlpacaClient) -> set[str]:
     blocked: set[str] = set()
     for p in client.list_open_positions():
         blocked.add(str(getattr(p, "symbol", "")).upper())
@@ -169,27 +186,45 @@ def main() -> None:
         args.max_new_approvals_total = max(args.max_new_approvals_total, 4)
         args.max_new_approvals_per_sleeve = max(args.max_new_approvals_per_sleeve, 2)
     sleeve_paths = [s.strip() for s in args.sleeves.split(",") if s.strip()]
-    blocked_symbols = get_live_blocked_symbols()
+    # One client (HTTP sessions and daily-bar cache) serves every sleeve;
+    # they all trade the same account.
+    client = AlpacaClient(AppConfig.from_env())
+    blocked_symbols = get_live_blocked_symbols(client)
     print("blocked_symbols_live:", ",".join(sorted(blocked_symbols)) if blocked_symbols else "none")
 
     all_pending: list[PendingSignal] = []
     for config_path in sleeve_paths:
-        cfg = load_config(config_path)
-        sleeve_id = cfg.get("sleeve_id", Path(config_path).stem)
-        print(f"\n== sleeve {sleeve_id} ({config_path}) ==")
-        for command in (["sync", "--limit", "100"], ["scan"]):
-            rc, out = run_main(config_path, command)
-            line = out.strip().splitlines()[-1] if out.strip() else ""
-            print(f"{' '.join(command)} -> rc={rc} {line}")
-        pending = load_pending_signals(
-            config_path=config_path,
-            signal_queue_path=cfg["signal_queue_path"],
-            sleeve_id=sleeve_id,
-        )
+        config = load_config(config_path)
+        print(f"\n== sleeve {config.sleeve_id} ({config_path}) ==")
+        try:
+            synced = sync_journal(
+                config,
+                client,
+                command_args("sync", "--limit", "100", "--ledger-sleeve-only"),
+            )
+            print(
+                f"sync -> entry_prices={synced.entry_prices} "
+                f"exit_fields={len(synced.exit_trade_ids)} "
+                f"applied_reviews={synced.reviews.applied} "
+                f"deferred_reviews={synced.reviews.deferred} "
+                f"duplicate_reviews={synced.reviews.duplicated} "
+                f"ledger_updates={synced.ledger_updates}"
+            )
+        except Exception as exc:
+            print(f"sync -> error={exc}")
+        try:
+            scanned = run_scan(config, client, command_args("scan"))
+            print(
+                f"scan -> candidates={len(scanned.ideas)} "
+                f"wrote_scan: {scanned.output_path}"
+            )
+        except Exception as exc:
+            print(f"scan -> error={exc}")
+        pending = load_pending_signals(config)
         print(f"pending_signals={len(pending)}")
         all_pending.extend(pending)
 
-    assessed = [assess_signal(s) for s in all_pending]
+    assessed = assess_signals(client, all_pending, args.assess_workers)
     approved_candidates = [s for s in assessed if s.recommendation == "approve"]
     rejected_candidates = [s for s in assessed if s.recommendation == "reject"]
 
@@ -234,21 +269,42 @@ def main() -> None:
             f"multi-sleeve allocator approve avg_r_180={s.avg_r_180:.2f} "
             f"note={s.assess_note or 'na'}"
         )
-        rc, out = run_main(
-            s.config_path,
-            ["approve-signal", "--signal-id", s.signal_id, "--reason", reason],
-        )
-        line = out.strip().splitlines()[-1] if out.strip() else ""
-        print(f"approve {s.sleeve_id} {s.symbol} -> rc={rc} {line}")
+        try:
+            result = approve_signal(
+                s.config,
+                client,
+                command_args(
+                    "approve-signal", "--signal-id", s.signal_id, "--reason", reason
+                ),
+            )
+        except Exception as exc:
+            print(f"approve {s.sleeve_id} {s.symbol} -> error={exc}")
+            continue
+        if result.status == "ignored":
+            print(
+                f"approve {s.sleeve_id} {s.symbol} -> ignored "
+                f"guard={result.guard} reason={result.reason}"
+            )
+        else:
+            print(f"approve {s.sleeve_id} {s.symbol} -> trade_id={result.trade_id}")
 
     if args.ignore_rejects:
         for s in rejected_candidates:
-            rc, out = run_main(
-                s.config_path,
-                ["ignore-signal", "--signal-id", s.signal_id, "--reason", "assess-multi reject"],
-            )
-            line = out.strip().splitlines()[-1] if out.strip() else ""
-            print(f"ignore {s.sleeve_id} {s.symbol} -> rc={rc} {line}")
+            try:
+                ignore_signal(
+                    s.config,
+                    command_args(
+                        "ignore-signal",
+                        "--signal-id",
+                        s.signal_id,
+                        "--reason",
+                        "assess-multi reject",
+                    ),
+                )
+            except Exception as exc:
+                print(f"ignore {s.sleeve_id} {s.symbol} -> error={exc}")
+                continue
+            print(f"ignore {s.sleeve_id} {s.symbol} -> ignored")
 
 
 if __name__ == "__main__":
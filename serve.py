@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+from typing import Callable, Iterator
+
+
+SHUTDOWN_RC = 128 + signal.SIGTERM
+
+
+class _Shutdown(BaseException):
+    # Raised from the SIGTERM handler. Not a SystemExit, so a stop that lands
+    # mid-command is never reported as that command exiting cleanly.
+    pass
+
+
+def _raise_shutdown(signum, frame) -> None:
+    raise _Shutdown
+
+
+class _StreamWriter(io.TextIOBase):
+    def __init__(self, connection: socket.socket, stream: str) -> None:
+        self._connection = connection
+        self._stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: str) -> int:
+        if data:
+            _send(self._connection, {"stream": self._stream, "data": data})
+        return len(data)
+
+
+def _send(connection: socket.socket, message: dict) -> None:
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+@contextlib.contextmanager
+def _environment(env: dict[str, str] | None) -> Iterator[None]:
+    # Config comes from the environment, so each command sees the caller's
+    # variables (SLEEVE_ID, journal paths, ALPACA_*) instead of the server's.
+    if env is None:
+        yield
+        return
+    saved = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+
+
+def serve(socket_path: str, run: Callable[[list[str], str | None], None]) -> None:
+    # Requests are handled one at a time: each one swaps the process-wide
+    # stdout/stderr and working directory while its command runs.
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    directory = os.path.dirname(socket_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    os.chmod(socket_path, 0o600)
+    server.listen()
+    signal.signal(signal.SIGTERM, _raise_shutdown)
+    print(f"serving on {socket_path}", flush=True)
+    try:
+        while True:
+            connection, _ = server.accept()
+            with connection:
+                _handle(connection, run)
+    except _Shutdown:
+        pass
+    finally:
+        server.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _handle(
+    connection: socket.socket, run: Callable[[list[str], str | None], None]
+) -> None:
+    with connection.makefile("r", encoding="utf-8") as reader:
+        line = reader.readline()
+    try:
+        request = json.loads(line)
+        argv = [str(value) for value in request["argv"]]
+        env = request.get("env")
+        if env is not None:
+            env = {str(key): str(value) for key, value in env.items()}
+    except (ValueError, KeyError, TypeError, AttributeError):
+        _send(connection, {"stream": "stderr", "data": "invalid request\n"})
+        _send(connection, {"rc": 2})
+        return
+    stdout = _StreamWriter(connection, "stdout")
+    stderr = _StreamWriter(connection, "stderr")
+    cwd = os.getcwd()
+    rc = 0
+    interrupted = False
+    with _environment(env):
+        try:
+            os.chdir(request.get("cwd") or cwd)
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                try:
+                    run(argv, request.get("config_path"))
+                except SystemExit as exc:
+                    if exc.code is None or isinstance(exc.code, int):
+                        rc = exc.code or 0
+                    else:
+                        print(exc.code, file=stderr)
+                        rc = 1
+                except Exception:
+                    traceback.print_exc(file=stderr)
+                    rc = 1
+                except _Shutdown:
+                    print("server shutting down; command interrupted", file=stderr)
+                    rc = SHUTDOWN_RC
+                    interrupted = True
+            _send(connection, {"rc": rc})
+        except OSError:
+            # The client went away; keep serving.
+            pass
+        finally:
+            os.chdir(cwd)
+    if interrupted:
+        raise _Shutdown
+
+
+def forward(socket_path: str, argv: list[str], config_path: str | None) -> int | None:
+    # Returns None when no server is listening so the caller can run the
+    # command locally instead.
+    if not os.path.exists(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+    with client:
+        _send(
+            client,
+            {
+                "argv": argv,
+                "cwd": os.getcwd(),
+                "config_path": config_path,
+                "env": dict(os.environ),
+            },
+        )
+        with client.makefile("r", encoding="utf-8") as reader:
+            for line in reader:
+                message = json.loads(line)
+                if "rc" in message:
+                    return int(message["rc"])
+                target = sys.stderr if message.get("stream") == "stderr" else sys.stdout
+                target.write(message.get("data", ""))
+                target.flush()
+    return 1
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import csv
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+INDEXED_FIELDS = ("trade_id", "signal_id", "order_id", "status")
+DEFAULT_TABLE = "rows"
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def is_sqlite_path(path: str) -> bool:
+    return path.split("#", 1)[0].lower().endswith(SQLITE_SUFFIXES)
+
+
+def open_store(path: str, fieldnames: list[str]) -> CsvStore | SqliteStore:
+    if is_sqlite_path(path):
+        return SqliteStore(path, fieldnames)
+    return CsvStore(path, fieldnames)
+
+
+def store_exists(path: str) -> bool:
+    if is_sqlite_path(path):
+        return SqliteStore(path, []).exists()
+    return os.path.exists(path)
+
+
+def copy_store(source_path: str, dest_path: str, fieldnames: list[str]) -> int:
+    rows = [
+        {field: row.get(field, "") for field in fieldnames}
+        for row in open_store(source_path, fieldnames).read_rows()
+    ]
+    dest = open_store(dest_path, fieldnames)
+    dest.create()
+    dest.write_rows(rows)
+    return len(rows)
+
+
+def _text(value: object) -> str:
+    return "" if value is None else str(value)
+
+
+def _make_dirs(path: str) -> None:
+    dir_name = os.path.dirname(path)
+    if dir_name:
+        os.makedirs(dir_name, exist_ok=True)
+
+
+class CsvStore:
+    def __init__(self, path: str, fieldnames: list[str]) -> None:
+        self.path = path
+        self.fieldnames = fieldnames
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def create(self) -> None:
+        _make_dirs(self.path)
+        if os.path.exists(self.path):
+            return
+        with open(self.path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=self.fieldnames)
+            writer.writeheader()
+
+    def ensure_schema(self) -> list[str]:
+        with open(self.path, "r", newline="", encoding="utf-8") as file:
+            header = next(csv.reader(file), [])
+        if not header:
+            return []
+        missing = [field for field in self.fieldnames if field not in header]
+        if not missing:
+            return []
+        rows = list(self.read_rows())
+        for row in rows:
+            for field in missing:
+                row[field] = ""
+        self.write_rows(rows)
+        return missing
+
+    def read_rows(self) -> Iterator[dict]:
+        with open(self.path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                yield row
+
+    def find(self, **criteria: str) -> list[dict]:
+        return [
+            row
+            for row in self.read_rows()
+            if all((row.get(field) or "") == value for field, value in criteria.items())
+        ]
+
+    def append(self, row: dict) -> None:
+        with open(self.path, "a", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=self.fieldnames)
+            writer.writerow(row)
+
+    def write_rows(self, rows: Iterable[dict]) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.DictWriter(file, fieldnames=self.fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_path, self.path)
+
+    def update(self, key_field: str, key_value: str, changes: dict) -> dict | None:
+        rows = list(self.read_rows())
+        updated = None
+        for row in rows:
+            if row.get(key_field) == key_value:
+                row.update(changes)
+                updated = row
+                break
+        if updated is None:
+            return None
+        self.write_rows(rows)
+        return updated
+
+    def save_rows(
+        self,
+        rows: list[dict],
+        changed: list[dict],
+        key_field: str,
+        added: list[dict] | None = None,
+    ) -> None:
+        # A CSV file can only be rewritten as a whole; rows already includes
+        # any added rows.
+        if changed or added:
+            self.write_rows(rows)
+
+
+class SqliteStore:
+    def __init__(self, path: str, fieldnames: list[str]) -> None:
+        db_path, _, table = path.partition("#")
+        table = table or DEFAULT_TABLE
+        if not _IDENTIFIER.match(table):
+            raise ValueError(f"Invalid SQLite table name: {table}")
+        self.path = path
+        self.db_path = db_path
+        self.table = table
+        self.fieldnames = fieldnames
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def _columns(self, connection: sqlite3.Connection) -> list[str]:
+        return [
+            row["name"]
+            for row in connection.execute(f'PRAGMA table_info("{self.table}")')
+        ]
+
+    def _create_indexes(self, connection: sqlite3.Connection) -> None:
+        columns = self._columns(connection)
+        for field in INDEXED_FIELDS:
+            if field in columns:
+                connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{self.table}_{field}_idx" '
+                    f'ON "{self.table}" ("{field}")'
+                )
+
+    def exists(self) -> bool:
+        if not os.path.exists(self.db_path):
+            return False
+        with self._transaction() as connection:
+            return bool(self._columns(connection))
+
+    def create(self) -> None:
+        _make_dirs(self.db_path)
+        columns = ", ".join(
+            f"\"{field}\" TEXT NOT NULL DEFAULT ''" for field in self.fieldnames
+        )
+        with self._transaction() as connection:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table}" ({columns})'
+            )
+            self._create_indexes(connection)
+
+    def ensure_schema(self) -> list[str]:
+        with self._transaction() as connection:
+            existing = self._columns(connection)
+            missing = [field for field in self.fieldnames if field not in existing]
+            for field in missing:
+                connection.execute(
+                    f'ALTER TABLE "{self.table}" '
+                    f"ADD COLUMN \"{field}\" TEXT NOT NULL DEFAULT ''"
+                )
+            self._create_indexes(connection)
+        return missing
+
+    def read_rows(self) -> Iterator[dict]:
+        # Fetch eagerly so no read lock is held while callers write back.
+        yield from self.find()
+
+    def find(self, **criteria: str) -> list[dict]:
+        where = " AND ".join(f'"{field}" = ?' for field in criteria) or "1"
+        with self._transaction() as connection:
+            cursor = connection.execute(
+                f'SELECT * FROM "{self.table}" WHERE {where} ORDER BY rowid',
+                [_text(value) for value in criteria.values()],
+            )
+            return [_row_dict(row) for row in cursor]
+
+    def append(self, row: dict) -> None:
+        self._insert_many([row], replace=False)
+
+    def write_rows(self, rows: Iterable[dict]) -> None:
+        self._insert_many(list(rows), replace=True)
+
+    def _insert_many(self, rows: list[dict], replace: bool) -> None:
+        columns = ", ".join(f'"{field}"' for field in self.fieldnames)
+        placeholders = ", ".join("?" for _ in self.fieldnames)
+        with self._transaction() as connection:
+            if replace:
+                connection.execute(f'DELETE FROM "{self.table}"')
+            connection.executemany(
+                f'INSERT INTO "{self.table}" ({columns}) VALUES ({placeholders})',
+                [
+                    [_text(row.get(field)) for field in self.fieldnames]
+                    for row in rows
+                ],
+            )
+
+    def update(self, key_field: str, key_value: str, changes: dict) -> dict | None:
+        assignments = ", ".join(f'"{field}" = ?' for field in changes)
+        with self._transaction() as connection:
+            match = connection.execute(
+                f'SELECT rowid FROM "{self.table}" WHERE "{key_field}" = ? '
+                "ORDER BY rowid LIMIT 1",
+                [key_value],
+            ).fetchone()
+            if match is None:
+                return None
+            connection.execute(
+                f'UPDATE "{self.table}" SET {assignments} WHERE rowid = ?',
+                [_text(value) for value in changes.values()] + [match[0]],
+            )
+            row = connection.execute(
+                f'SELECT * FROM "{self.table}" WHERE rowid = ?', [match[0]]
+            ).fetchone()
+            return _row_dict(row)
+
+    def save_rows(
+        self,
+        rows: list[dict],
+        changed: list[dict],
+        key_field: str,
+        added: list[dict] | None = None,
+    ) -> None:
+        if not changed and not added:
+            return
+        fields = [field for field in self.fieldnames if field != key_field]
+        assignments = ", ".join(f'"{field}" = ?' for field in fields)
+        columns = ", ".join(f'"{field}"' for field in self.fieldnames)
+        placeholders = ", ".join("?" for _ in self.fieldnames)
+        with self._transaction() as connection:
+            connection.executemany(
+                f'UPDATE "{self.table}" SET {assignments} WHERE "{key_field}" = ?',
+                [
+                    [_text(row.get(field)) for field in fields]
+                    + [_text(row.get(key_field))]
+                    for row in changed
+                ],
+            )
+            connection.executemany(
+                f'INSERT INTO "{self.table}" ({columns}) VALUES ({placeholders})',
+                [
+                    [_text(row.get(field)) for field in self.fieldnames]
+                    for row in added or []
+                ],
+            )
+
+
+def _row_dict(row: sqlite3.Row) -> dict:
+    return {key: _text(row[key]) for key in row.keys()}
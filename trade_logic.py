@@ -1,9 +1,34 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from alpaca_client import AlpacaClient
-from regime import detect_regime, regime_allows
+from bar_cache import DEFAULT_READY_TIME, NY_TZ, daily_bar_ready
+from regime import latest_regimes, regime_allows
+
+
+TARGET_R = 2.0
+SETUPS = {
+    "MeanReversion_D1": {
+        "entry_reason": "yesterday close < prior day low",
+        "invalidation_reason": "Closes below yesterday low",
+        "stop_loss_logic": "Below yesterday low",
+        "market_context": "range",
+    },
+    "TwoDayBreakout_D1": {
+        "entry_reason": "yesterday close > prior 2-day high",
+        "invalidation_reason": "Closes back below prior 2-day high",
+        "stop_loss_logic": "Below prior 2-day low",
+        "market_context": "trend",
+    },
+    "PrevDayBreakout_D1": {
+        "entry_reason": "yesterday close > prior day high",
+        "invalidation_reason": "Closes back below prior day high",
+        "stop_loss_logic": "Below prior day low",
+        "market_context": "trend",
+    },
+}
 
 
 def _setup_enabled(allowed_setups: set[str] | None, name: str) -> bool:
@@ -12,105 +37,156 @@ def _setup_enabled(allowed_setups: set[str] | None, name: str) -> bool:
     return name in allowed_setups
 
 
+def _idea(symbol: str, setup_name: str, stop_level: float) -> dict:
+    setup = SETUPS[setup_name]
+    stop_price = round(float(stop_level), 2)
+    return {
+        "symbol": symbol,
+        "direction": "long",
+        "setup_name": setup_name,
+        "entry_reason": (
+            "Using completed daily bars due to 15-min delayed data; "
+            f"{setup['entry_reason']}"
+        ),
+        "invalidation_reason": setup["invalidation_reason"],
+        "stop_loss_logic": f"{setup['stop_loss_logic']} ({stop_price:.2f})",
+        "take_profit_logic": f"{TARGET_R:g}R target",
+        "stop_price": stop_price,
+        "target_r": TARGET_R,
+        "market_context": setup["market_context"],
+        "emotional_state": "calm",
+    }
+
+
+def _bar_timestamps(bars: pd.DataFrame) -> np.ndarray:
+    stamps = bars["timestamp"] if "timestamp" in bars.columns else bars.index
+    if not isinstance(stamps, pd.DatetimeIndex):
+        stamps = pd.DatetimeIndex(pd.to_datetime(stamps, utc=True))
+    # asi8 is UTC for aware indexes and naive ones are read as UTC anyway.
+    return stamps.as_unit("ns").asi8
+
+
 def find_trade_idea(
     client: AlpacaClient,
     symbol: str,
     allowed_setups: set[str] | None = None,
     regime_filter: dict | None = None,
+    bars: pd.DataFrame | None = None,
 ) -> dict | None:
-    bars = client.get_recent_daily_bars(symbol)
-    if bars is None or bars.empty:
-        return None
+    if bars is None:
+        bars = client.get_recent_daily_bars(symbol)
+    ideas = scan_universe(
+        {symbol: bars},
+        {symbol: allowed_setups},
+        regime_filter,
+        daily_bar_ready_time=client.daily_bar_ready_time,
+    )
+    return ideas[0] if ideas else None
 
-    bars = bars.reset_index()
-    bars["timestamp"] = pd.to_datetime(bars["timestamp"], utc=True).dt.tz_convert(
-        "America/New_York"
+
+def scan_universe(
+    bars_by_symbol: dict[str, pd.DataFrame | None],
+    allowed_setups_map: dict[str, set[str] | None] | None = None,
+    regime_filter: dict | None = None,
+    daily_bar_ready_time: str = DEFAULT_READY_TIME,
+    now: pd.Timestamp | None = None,
+) -> list[dict]:
+    # Every symbol's bars are stacked into flat arrays ordered by
+    # (symbol, time), so the latest three bars of each symbol sit just
+    # before its group end and each setup rule is one array comparison.
+    symbols = [
+        symbol
+        for symbol, bars in bars_by_symbol.items()
+        if bars is not None and not bars.empty
+    ]
+    if not symbols:
+        return []
+    allowed_setups_map = allowed_setups_map or {}
+    frames = [bars_by_symbol[symbol] for symbol in symbols]
+    codes = np.repeat(np.arange(len(symbols)), [len(bars) for bars in frames])
+    stamps = np.concatenate([_bar_timestamps(bars) for bars in frames])
+    order = np.lexsort((stamps, codes))
+    codes = codes[order]
+    stamps = stamps[order]
+    high, low, close = (
+        np.concatenate([bars[column].to_numpy(dtype=float) for bars in frames])[order]
+        for column in ("high", "low", "close")
     )
-    bars = bars.sort_values("timestamp")
-
-    today = pd.Timestamp.now(tz="America/New_York").date()
-    now = pd.Timestamp.now(tz="America/New_York")
-    daily_bar_ready = now.time() >= pd.Timestamp("16:20").time()
-    if bars["timestamp"].dt.date.max() == today and not daily_bar_ready:
-        bars = bars[bars["timestamp"].dt.date < today]
-
-    if len(bars) < 2:
-        return None
-
-    prior_bar = bars.iloc[-2]
-    latest_bar = bars.iloc[-1]
-    prior_two_bar = bars.iloc[-3] if len(bars) >= 3 else None
-    regime = None
-    if regime_filter and regime_filter.get("enabled", False):
-        regime = detect_regime(
-            bars,
+
+    if now is None:
+        now = pd.Timestamp.now(tz=NY_TZ)
+    if not daily_bar_ready(now, daily_bar_ready_time):
+        days = (
+            pd.to_datetime(stamps, utc=True)
+            .tz_convert(NY_TZ)
+            .tz_localize(None)
+            .to_numpy()
+            .astype("datetime64[D]")
+        )
+        keep = days != np.datetime64(now.tz_convert(NY_TZ).date(), "D")
+        codes = codes[keep]
+        high = high[keep]
+        low = low[keep]
+        close = close[keep]
+    if not len(close):
+        return []
+
+    counts = np.bincount(codes, minlength=len(symbols))
+    ends = np.cumsum(counts)
+    has_prior = counts >= 2
+    has_prior_two = counts >= 3
+    latest = np.maximum(ends - 1, 0)
+    prior = np.maximum(ends - 2, 0)
+    prior_two = np.maximum(ends - 3, 0)
+    latest_close = close[latest]
+    prior_high = high[prior]
+    prior_low = low[prior]
+    # Same operand order as the builtin max/min, so NaN bars pick the
+    # same level they always did.
+    two_day_high = np.where(high[prior_two] > prior_high, high[prior_two], prior_high)
+    two_day_low = np.where(low[prior_two] < prior_low, low[prior_two], prior_low)
+    two_day_enabled = np.array(
+        [
+            _setup_enabled(allowed_setups_map.get(symbol), "TwoDayBreakout_D1")
+            for symbol in symbols
+        ]
+    )
+
+    inside_high = latest_close <= prior_high
+    mean_reversion = has_prior & inside_high & ~(latest_close >= prior_low)
+    breakout = has_prior & ~inside_high
+    two_day = (
+        breakout & has_prior_two & two_day_enabled & (latest_close > two_day_high)
+    )
+    prev_day = breakout & ~two_day
+    setups = np.select(
+        [mean_reversion, two_day, prev_day],
+        ["MeanReversion_D1", "TwoDayBreakout_D1", "PrevDayBreakout_D1"],
+        default="",
+    )
+    stop_levels = np.select(
+        [mean_reversion, two_day, prev_day],
+        [low[latest], two_day_low, prior_low],
+        default=np.nan,
+    )
+
+    regimes = None
+    if regime_filter and regime_filter.get("enabled", False) and has_prior.any():
+        regimes = latest_regimes(
+            close,
+            codes,
+            len(symbols),
             fast_sma=regime_filter.get("fast_sma", 20),
             slow_sma=regime_filter.get("slow_sma", 50),
         )
 
-    if latest_bar["close"] <= prior_bar["high"]:
-        if latest_bar["close"] >= prior_bar["low"]:
-            return None
-        if not _setup_enabled(allowed_setups, "MeanReversion_D1"):
-            return None
-        if regime_filter and regime_filter.get("enabled", False):
-            if not regime_allows("MeanReversion_D1", regime):
-                return None
-        return {
-            "symbol": symbol,
-            "direction": "long",
-            "setup_name": "MeanReversion_D1",
-            "entry_reason": (
-                "Using completed daily bars due to 15-min delayed data; "
-                "yesterday close < prior day low"
-            ),
-            "invalidation_reason": "Closes below yesterday low",
-            "stop_loss_logic": f"Below yesterday low ({latest_bar['low']:.2f})",
-            "take_profit_logic": "2R target",
-            "market_context": "range",
-            "emotional_state": "calm",
-        }
-
-    if (
-        prior_two_bar is not None
-        and _setup_enabled(allowed_setups, "TwoDayBreakout_D1")
-        and latest_bar["close"] > max(prior_bar["high"], prior_two_bar["high"])
-    ):
-        if regime_filter and regime_filter.get("enabled", False):
-            if not regime_allows("TwoDayBreakout_D1", regime):
-                return None
-        stop_level = min(prior_bar["low"], prior_two_bar["low"])
-        return {
-            "symbol": symbol,
-            "direction": "long",
-            "setup_name": "TwoDayBreakout_D1",
-            "entry_reason": (
-                "Using completed daily bars due to 15-min delayed data; "
-                "yesterday close > prior 2-day high"
-            ),
-            "invalidation_reason": "Closes back below prior 2-day high",
-            "stop_loss_logic": f"Below prior 2-day low ({stop_level:.2f})",
-            "take_profit_logic": "2R target",
-            "market_context": "trend",
-            "emotional_state": "calm",
-        }
-
-    if not _setup_enabled(allowed_setups, "PrevDayBreakout_D1"):
-        return None
-    if regime_filter and regime_filter.get("enabled", False):
-        if not regime_allows("PrevDayBreakout_D1", regime):
-            return None
-    return {
-        "symbol": symbol,
-        "direction": "long",
-        "setup_name": "PrevDayBreakout_D1",
-        "entry_reason": (
-            "Using completed daily bars due to 15-min delayed data; "
-            "yesterday close > prior day high"
-        ),
-        "invalidation_reason": "Closes back below prior day high",
-        "stop_loss_logic": f"Below prior day low ({prior_bar['low']:.2f})",
-        "take_profit_logic": "2R target",
-        "market_context": "trend",
-        "emotional_state": "calm",
-    }
+    ideas: list[dict] = []
+    for index in np.flatnonzero(setups != ""):
+        symbol = symbols[index]
+        setup_name = str(setups[index])
+        if not _setup_enabled(allowed_setups_map.get(symbol), setup_name):
+            continue
+        if regimes is not None and not regime_allows(setup_name, regimes[index]):
+            continue
+        ideas.append(_idea(symbol, setup_name, stop_levels[index]))
+    return ideas